@@ -0,0 +1,10 @@
+"""Benchmarks of mdptools on scalable families of models"""
+
+from .models import (
+    FAMILIES,
+    philosophers,
+    sensors,
+    leader_election,
+    bounded_queue,
+)
+from .suite import run, run_family
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+import json
+from argparse import ArgumentParser, Namespace
+
+from .models import FAMILIES
+from .suite import run
+
+
+def main(args: Namespace):
+    results = run(args.families, args.sizes, args.repeat)
+    text = json.dumps(results, indent=2)
+    if args.output is None:
+        print(text)
+        return
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(text)
+    for family, curves in results["families"].items():
+        print(f"{family}: sizes {curves['sizes']}, states {curves['states']}")
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "-f",
+        "--families",
+        type=str,
+        nargs="+",
+        choices=list(FAMILIES),
+        help="the model families to run (all by default)",
+    )
+    parser.add_argument(
+        "-n",
+        "--sizes",
+        type=int,
+        nargs="+",
+        help="the sizes of the models (defaults depend on the family)",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=3,
+        help="the number of runs of each operation, the best time is kept",
+    )
+    parser.add_argument(
+        "-o", "--output", type=str, help="the JSON file to write"
+    )
+    main(parser.parse_args())
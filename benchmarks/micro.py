@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks of the primitives dominating the profiles of a search,
+with baselines to detect regressions
+"""
+
+import json
+import platform
+import sys
+import timeit
+from argparse import ArgumentParser, Namespace
+from datetime import datetime, timezone
+
+from mdptools import MarkovDecisionProcess as MDP
+from mdptools.model import State, dist_product
+from mdptools.types import imdict
+from .models import philosophers, sensors
+
+# Relative slowdown beyond which a primitive is reported as a regression
+THRESHOLD = 0.1
+
+
+def _fixtures() -> dict:
+    """A reachable state of 4 philosophers, a distinct but equal copy, and a
+    transition enabled in it
+    """
+    mdp = MDP(*philosophers(4))
+    s = mdp.init
+    t = mdp.enabled_take_one(s)
+    t2 = next(t2 for t2 in mdp.transitions if t.can_be_dependent(t2))
+    sensor, device = sensors(1)
+    return {
+        "mdp": mdp,
+        "s": s,
+        "copy": State(frozenset(s.s), imdict(s.ctx)),
+        "t": t,
+        "t2": t2,
+        "update": next(iter(t.post.keys()))[1],
+        "dist1": sensor.transitions[0].post,
+        "dist2": device.transitions[2].post,
+    }
+
+
+def microbenchmarks() -> dict:
+    """The benchmarked primitives, as calls without arguments"""
+    f = _fixtures()
+    s, t = f["s"], f["t"]
+    return {
+        "State.__hash__": lambda: hash(f["copy"]),
+        "State.__eq__": lambda: s == f["copy"],
+        "imdict.__hash__": lambda: hash(s.ctx),
+        "Transition.is_enabled": lambda: t.is_enabled(s),
+        "Transition.successors": lambda: t.successors(s),
+        "Guard.__call__": lambda: t.guard(s.ctx),
+        "Command.__call__": lambda: f["update"](s.ctx),
+        "dist_product": lambda: dist_product(f["dist1"], f["dist2"]),
+        "Transition.can_be_dependent": lambda: t.can_be_dependent(f["t2"]),
+    }
+
+
+def run(number: int = 10_000, repeat: int = 5) -> dict:
+    """Times each primitive, keeping the best of `repeat` runs of `number`
+    calls, in nanoseconds per call
+    """
+    results = {}
+    for name, call in microbenchmarks().items():
+        times = timeit.Timer(call).repeat(repeat=repeat, number=number)
+        results[name] = min(times) / number * 1e9
+    return {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "number": number,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    results: dict, baseline: dict, threshold: float = THRESHOLD
+) -> list[tuple[str, float, float, float, bool]]:
+    """Compares results to a baseline, returning for each primitive in both
+    the baseline time, the current time, their ratio, and whether the current
+    time is more than `threshold` slower
+    """
+    rows = []
+    for name, current in results["results"].items():
+        if name not in baseline["results"]:
+            continue
+        base = baseline["results"][name]
+        ratio = current / base if base else float("inf")
+        rows.append((name, base, current, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def format_comparison(rows: list) -> str:
+    width = max((len(row[0]) for row in rows), default=0)
+    lines = [
+        f"{'primitive'.ljust(width)}  {'baseline':>10}  {'current':>10}"
+        f"  {'ratio':>6}"
+    ]
+    for name, base, current, ratio, regressed in rows:
+        lines.append(
+            f"{name.ljust(width)}  {base:>8.0f}ns  {current:>8.0f}ns"
+            f"  {ratio:>6.2f}{'  REGRESSION' if regressed else ''}"
+        )
+    return "\n".join(lines)
+
+
+def main(args: Namespace) -> int:
+    results = run(args.number, args.repeat)
+    if args.save is not None:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.compare is None:
+        for name, ns in results["results"].items():
+            print(f"{name}: {ns:.0f}ns")
+        return 0
+    with open(args.compare, encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare(results, baseline, args.threshold)
+    print(format_comparison(rows))
+    return 1 if any(row[-1] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(prog="python -m benchmarks.micro")
+    parser.add_argument(
+        "-s", "--save", type=str, help="write the results as a baseline"
+    )
+    parser.add_argument(
+        "-c", "--compare", type=str, help="the baseline to compare against"
+    )
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=THRESHOLD,
+        help="the relative slowdown reported as a regression",
+    )
+    parser.add_argument(
+        "-n",
+        "--number",
+        type=int,
+        default=10_000,
+        help="the number of calls in each run",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=5,
+        help="the number of runs, the best one is kept",
+    )
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,113 @@
+"""Scalable families of models, each returning the processes to compose"""
+
+from mdptools import MarkovDecisionProcess as MDP
+
+
+def philosophers(n: int) -> list[MDP]:
+    """N dining philosophers around a table, philosopher i takes fork i
+    first and fork i+1 second (generalising `examples/philosopher.py`)
+    """
+
+    def philosopher(i: int) -> MDP:
+        left, right = f"f{i}", f"f{i % n + 1}"
+        s = [f"p{i}_{k}" for k in range(4)]
+        return MDP(
+            [
+                (f"take-l_{i}", (s[0], f"{left}=0"), (s[1], f"{left}:=1")),
+                (f"take-r_{i}", (s[1], f"{right}=0"), (s[2], f"{right}:=1")),
+                (f"release-l_{i}", s[2], (s[3], f"{left}:=0")),
+                (f"release-r_{i}", s[3], (s[0], f"{right}:=0")),
+            ],
+            init=(s[0], f"{left}:=0"),
+            name=f"P{i}",
+        )
+
+    return [philosopher(i + 1) for i in range(n)]
+
+
+def sensors(n: int) -> list[MDP]:
+    """N sensors and the device they shut down (from
+    `examples/kwiatkowska2013.py`)
+    """
+
+    def sensor(i: int) -> MDP:
+        s = [f"active_{i}", f"detected_{i}", f"alert_{i}", f"inactive_{i}"]
+        return MDP(
+            [
+                (f"detect_{i}", s[0], {s[1]: 0.8, s[2]: 0.2}),
+                (f"warn_{i}", s[1], s[2]),
+                (f"shutdown_{i}", s[2], s[3]),
+                (f"off_{i}", s[3]),
+            ],
+            init=s[0],
+            name=f"S{i}",
+        )
+
+    s = ["running", "stopping", "off", "failing"]
+    trs = [("fail", s[3])]
+    for i in range(1, n + 1):
+        trs += [
+            (f"warn_{i}", s[0], s[1]),
+            (f"shutdown_{i}", s[0], {s[2]: 0.9, s[3]: 0.1}),
+            (f"shutdown_{i}", s[1], s[2]),
+            (f"off_{i}", s[2]),
+        ]
+    device = MDP(trs, init=s[0], name="D")
+    return [sensor(i + 1) for i in range(n)] + [device]
+
+
+def leader_election(n: int) -> list[MDP]:
+    """N processes flipping coins until heads, the first to claim the shared
+    `leader` variable is elected and the others become followers
+    """
+
+    def candidate(i: int) -> MDP:
+        s = [f"c{i}_{k}" for k in range(4)]
+        return MDP(
+            [
+                (f"flip_{i}", s[0], {s[1]: 0.5, s[0]: 0.5}),
+                (f"claim_{i}", (s[1], "leader=0"), (s[2], f"leader:={i}")),
+                (f"follow_{i}", (s[1], "leader>0"), s[3]),
+                (f"lead_{i}", s[2]),
+                (f"wait_{i}", s[3]),
+            ],
+            init=(s[0], "leader:=0"),
+            name=f"C{i}",
+        )
+
+    return [candidate(i + 1) for i in range(n)]
+
+
+def bounded_queue(n: int, capacity: int = None) -> list[MDP]:
+    """N producers putting items in a shared queue of `capacity` (N by
+    default) slots, and a consumer taking them out
+    """
+    if capacity is None:
+        capacity = n
+
+    def producer(i: int) -> MDP:
+        s = [f"q{i}_0", f"q{i}_1"]
+        trs = [(f"produce_{i}", s[0], s[1])]
+        trs += [
+            (f"put_{i}_{k}", (s[1], f"size={k}"), (s[0], f"size:={k + 1}"))
+            for k in range(capacity)
+        ]
+        return MDP(trs, init=(s[0], "size:=0"), name=f"Q{i}")
+
+    consumer = MDP(
+        [
+            (f"get_{k}", ("c_0", f"size={k}"), ("c_0", f"size:={k - 1}"))
+            for k in range(1, capacity + 1)
+        ],
+        init=("c_0", "size:=0"),
+        name="C",
+    )
+    return [producer(i + 1) for i in range(n)] + [consumer]
+
+
+FAMILIES = {
+    "philosophers": philosophers,
+    "sensors": sensors,
+    "leader_election": leader_election,
+    "bounded_queue": bounded_queue,
+}
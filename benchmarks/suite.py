@@ -0,0 +1,107 @@
+"""Times the main operations of mdptools on the scalable model families"""
+
+import platform
+import time
+from datetime import datetime, timezone
+
+from mdptools import MarkovDecisionProcess as MDP, validate
+from mdptools.set_methods import (
+    conflicting_transitions,
+    overmans_algorithm,
+    stubborn_sets,
+)
+from .models import FAMILIES
+
+SET_METHODS = [conflicting_transitions, overmans_algorithm, stubborn_sets]
+
+DEFAULT_SIZES = {
+    "philosophers": [2, 3, 4, 5],
+    "sensors": [1, 2, 3],
+    "leader_election": [2, 3, 4],
+    "bounded_queue": [1, 2, 3],
+}
+
+
+def operations() -> dict:
+    """The timed operations, each called with the processes of the model and
+    their composition
+    """
+    ops = {
+        "compose": lambda processes, _: MDP(*processes),
+        "search": lambda _, mdp: _count(mdp.search(silent=True)),
+        "bfs": lambda _, mdp: _count(mdp.bfs(silent=True)),
+        "validate": lambda _, mdp: validate(mdp),
+        "to_prism": lambda _, mdp: mdp.to_prism(),
+        "graph": lambda _, mdp: mdp.to_graph(),
+    }
+    for set_method in SET_METHODS:
+        ops[f"search[{set_method.__name__}]"] = (
+            lambda _, mdp, set_method=set_method: _count(
+                mdp.search(set_method=set_method, silent=True)
+            )
+        )
+    return ops
+
+
+def run_family(family: str, sizes: list[int], repeat: int = 3) -> dict:
+    """Times each operation for each size of the family, returning a curve
+    (one value per size) for the state space size and for each operation
+    """
+    curves = {"sizes": list(sizes), "states": [], "transitions": []}
+    timings = {name: [] for name in operations()}
+    for n in sizes:
+        processes = FAMILIES[family](n)
+        mdp = MDP(*processes)
+        result = mdp.explore(silent=True)
+        curves["states"].append(result.states)
+        curves["transitions"].append(
+            sum(map(len, result.transition_map.values()))
+        )
+        for name, op in operations().items():
+            timings[name].append(_best_time(op, processes, mdp, repeat))
+    for set_method in SET_METHODS:
+        curves[f"states[{set_method.__name__}]"] = [
+            MDP(*FAMILIES[family](n))
+            .explore(set_method=set_method, silent=True)
+            .states
+            for n in sizes
+        ]
+    curves["timings"] = timings
+    return curves
+
+
+def run(families: list[str] = None, sizes: list[int] = None, repeat=3) -> dict:
+    """Runs the benchmark for the given families (all by default), using the
+    given sizes or the default ones of each family
+    """
+    if families is None:
+        families = list(FAMILIES)
+    return {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+        },
+        "families": {
+            family: run_family(
+                family,
+                sizes if sizes is not None else DEFAULT_SIZES[family],
+                repeat,
+            )
+            for family in families
+        },
+    }
+
+
+def _best_time(op, processes: list[MDP], mdp: MDP, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        op(processes, mdp)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _count(generator) -> int:
+    return sum(1 for _ in generator)
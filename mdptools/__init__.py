@@ -1,6 +1,6 @@
 """Tools for representing and manipulating Markov Decision Processes (MDP)
 """
-from .mdp import MarkovDecisionProcess
+from .mdp import MarkovDecisionProcess, compose
 from .graph import graph
 from .validate import validate
 
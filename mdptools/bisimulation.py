@@ -0,0 +1,176 @@
+"""Strong probabilistic bisimulation minimisation by partition refinement"""
+
+from .types import (
+    MarkovDecisionProcess as MDP,
+    ActionMap,
+    Callable,
+    Distribution,
+    Generator,
+    Hashable,
+    State,
+)
+from .utils import np, id_register, ordered_state_str
+from .search import explore
+
+# Probabilities are rounded before comparing lifted distributions
+DECIMALS = 12
+
+
+def partition(
+    mdp: MDP,
+    labels: Callable[[State], Hashable] = None,
+    transition_map: dict[State, ActionMap] = None,
+    **kw,
+) -> tuple[list[State], np.ndarray]:
+    """Computes the coarsest strong probabilistic bisimulation of the explored
+    state space of `mdp`, refining the initial partition given by `labels`.
+    The state space is fully explored, unless a `set_method` is given.
+
+    Returns:
+        tuple[list[State], np.ndarray]: the states, and the block of each state
+    """
+    if transition_map is None:
+        transition_map = _explore(mdp, **kw)
+    states = list(transition_map.keys())
+    index = {s: i for i, s in enumerate(states)}
+    action_id = id_register()
+
+    # Store the transition relation as sparse rows, one row per transition
+    row_state, row_action = [], []
+    edge_row, edge_dst, edge_p = [], [], []
+    for i, s in enumerate(states):
+        for a, dist in _rows(mdp, s, transition_map):
+            row = len(row_state)
+            row_state.append(i)
+            row_action.append(action_id(a))
+            for s_, p in dist.items():
+                edge_row.append(row)
+                edge_dst.append(index[s_])
+                edge_p.append(p)
+    row_state = np.array(row_state, dtype=np.int64)
+    row_action = np.array(row_action, dtype=np.int64)
+    edge_row = np.array(edge_row, dtype=np.int64)
+    edge_dst = np.array(edge_dst, dtype=np.int64)
+    edge_p = np.array(edge_p, dtype=np.float64)
+
+    if labels is None:
+        blocks = np.zeros(len(states), dtype=np.int64)
+    else:
+        blocks = _renumber(labels(s) for s in states)
+
+    n_blocks = -1
+    while n_blocks != blocks.max(initial=-1) + 1:
+        n_blocks = blocks.max(initial=-1) + 1
+        rows = _lift(blocks, edge_row, edge_dst, edge_p, len(row_state))
+        signatures = [(b, set()) for b in blocks.tolist()]
+        for i, a, row in zip(row_state.tolist(), row_action.tolist(), rows):
+            signatures[i][1].add((a, row))
+        blocks = _renumber((b, frozenset(sig)) for b, sig in signatures)
+
+    return states, blocks
+
+
+def quotient(
+    mdp: MDP,
+    labels: Callable[[State], Hashable] = None,
+    name: str = None,
+    **kw,
+) -> MDP:
+    """Minimises the explored state space of `mdp` with respect to strong
+    probabilistic bisimulation, returning the quotient as a single process MDP.
+    Each block is named after one of its states. As in `partition`, the state
+    space is fully explored unless a `set_method` is given.
+    """
+    from .mdp import MarkovDecisionProcess
+
+    transition_map = _explore(mdp, **kw)
+    states, blocks = partition(mdp, labels, transition_map)
+
+    # Pick the first state of each block as its representative
+    representatives = {}
+    for s, b in zip(states, blocks.tolist()):
+        representatives.setdefault(b, s)
+    block_names = {b: _state_name(s, mdp) for b, s in representatives.items()}
+    block_of = dict(zip(states, blocks.tolist()))
+
+    transitions = {}
+    for b, s in representatives.items():
+        for a, dist in _rows(mdp, s, transition_map):
+            post = {}
+            for s_, p in dist.items():
+                name_ = block_names[block_of[s_]]
+                post[name_] = post.get(name_, 0) + p
+            # Transitions of a state may lead to the same blocks
+            key = (a, b, frozenset(post.items()))
+            transitions.setdefault(key, (a, block_names[b], post))
+
+    return MarkovDecisionProcess(
+        list(transitions.values()),
+        init=block_names[block_of[states[0]]],
+        name=name or mdp.name,
+    )
+
+
+def _explore(mdp: MDP, **kw) -> dict[State, ActionMap]:
+    kw.setdefault("set_method", False)
+    return explore(mdp, silent=True, **kw).transition_map
+
+
+def _rows(
+    mdp: MDP, s: State, transition_map: dict[State, ActionMap]
+) -> Generator[tuple[str, Distribution], None, None]:
+    """The distribution of each explored transition of s. The action map of the
+    search keeps one distribution per action, so the enabled transitions are
+    taken again to keep apart the ones with the same action, unless they lead
+    out of the explored states (e.g. with a `symmetry` or `compress_tau`).
+    """
+    by_action = {}
+    for tr in mdp.enabled(s):
+        by_action.setdefault(tr.action, []).append(tr.successors(s))
+    for a, dist in transition_map[s].items():
+        dists = by_action.get(a, ())
+        if dists and all(s_ in transition_map for d in dists for s_ in d):
+            yield from ((a, d) for d in dists)
+        else:
+            yield a, dist
+
+
+def _lift(
+    blocks: np.ndarray,
+    edge_row: np.ndarray,
+    edge_dst: np.ndarray,
+    edge_p: np.ndarray,
+    n_rows: int,
+) -> list[tuple]:
+    """Lift each row to a distribution over blocks, summing the probabilities of
+    states in the same block
+    """
+    edge_block = blocks[edge_dst]
+    order = np.lexsort((edge_block, edge_row))
+    row, block, p = edge_row[order], edge_block[order], edge_p[order]
+    if len(order) == 0:
+        return [()] * n_rows
+    # Find the start of each (row, block) segment and sum the segments
+    starts = np.flatnonzero(
+        np.concatenate(
+            ([True], (row[1:] != row[:-1]) | (block[1:] != block[:-1]))
+        )
+    )
+    sums = np.round(np.add.reduceat(p, starts), DECIMALS)
+    lifted = [[] for _ in range(n_rows)]
+    for r, b, q in zip(
+        row[starts].tolist(), block[starts].tolist(), sums.tolist()
+    ):
+        lifted[r].append((b, q))
+    return [tuple(row) for row in lifted]
+
+
+def _renumber(keys) -> np.ndarray:
+    """Number the distinct keys in order of first appearance"""
+    uid = id_register()
+    return np.array([uid(key) for key in keys], dtype=np.int64)
+
+
+def _state_name(s: State, mdp: MDP) -> str:
+    ctx = "".join(f"_{k}_{v}" for k, v in sorted(s.ctx.items()))
+    return ordered_state_str(s, mdp) + ctx
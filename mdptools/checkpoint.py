@@ -0,0 +1,122 @@
+"""Checkpoints for resuming long-running searches"""
+
+import gzip
+import os
+import pickle
+from dataclasses import replace
+from hashlib import blake2b
+from queue import Queue
+
+from .types import (
+    MarkovDecisionProcess as MDP,
+    ActionMap,
+    State,
+    Transition,
+    dataclass,
+)
+from .visited import VisitedSet
+
+
+@dataclass
+class Checkpoint:
+    """A snapshot of the frontier, the visited set and the partial transition
+    relation of a search. The sleep sets are saved as indices of transitions of
+    the model, which hold guards and updates that cannot be pickled.
+    """
+
+    fingerprint: str
+    frontier: list[tuple[State, int]]
+    visited: VisitedSet
+    transition_map: dict[State, ActionMap]
+    states: int
+    sleep: dict[State, frozenset[Transition]] = None
+    awake: dict[State, frozenset[Transition]] = None
+
+
+def model_fingerprint(mdp: MDP) -> str:
+    """Returns a digest of the initial state and the transitions of an MDP,
+    independent of the order in which they were defined
+    """
+    digest = blake2b(digest_size=16)
+    digest.update(_state_text(mdp.init).encode("utf-8"))
+    for text in sorted(map(_transition_text, mdp.transitions)):
+        digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def save_checkpoint(file_path: str, mdp: MDP, checkpoint: Checkpoint):
+    """Atomically writes a compressed checkpoint to `file_path`"""
+    checkpoint.fingerprint = model_fingerprint(mdp)
+    index = {tr: i for i, tr in enumerate(_ordered_transitions(mdp))}
+    saved = replace(
+        checkpoint,
+        sleep=_map_sleep_sets(checkpoint.sleep, index.__getitem__),
+        awake=_map_sleep_sets(checkpoint.awake, index.__getitem__),
+    )
+    tmp_path = f"{file_path}.tmp"
+    with gzip.open(tmp_path, "wb", compresslevel=1) as f:
+        pickle.dump(saved, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, file_path)
+
+
+def load_checkpoint(file_path: str, mdp: MDP) -> Checkpoint:
+    """Reads a checkpoint, raising a ValueError if it was made for another model"""
+    with gzip.open(file_path, "rb") as f:
+        checkpoint: Checkpoint = pickle.load(f)
+    if checkpoint.fingerprint != model_fingerprint(mdp):
+        raise ValueError(
+            f"Checkpoint '{file_path}' does not match the model [{mdp.name}]"
+        )
+    # The fingerprint pins the transitions, and so their order
+    transitions = _ordered_transitions(mdp)
+    checkpoint.sleep = _map_sleep_sets(
+        checkpoint.sleep, transitions.__getitem__
+    )
+    checkpoint.awake = _map_sleep_sets(
+        checkpoint.awake, transitions.__getitem__
+    )
+    return checkpoint
+
+
+def queue_items(queue: Queue) -> list:
+    """Returns the items of a queue in the order they should be put back"""
+    if hasattr(queue, "queue"):
+        return list(queue.queue)
+    # A SimpleQueue has to be drained and refilled
+    items = []
+    while not queue.empty():
+        items.append(queue.get())
+    for item in items:
+        queue.put(item)
+    return items
+
+
+def _ordered_transitions(mdp: MDP) -> list[Transition]:
+    """The transitions in the order of the fingerprint, which does not depend
+    on the order they were defined in
+    """
+    return sorted(mdp.transitions, key=_transition_text)
+
+
+def _map_sleep_sets(sets: dict[State, frozenset], fn) -> dict:
+    if sets is None:
+        return None
+    return {s: frozenset(map(fn, trs)) for s, trs in sets.items()}
+
+
+def _state_text(s: State) -> str:
+    ctx = ",".join(f"{k}={v}" for k, v in sorted(s.ctx.items()))
+    return ",".join(sorted(s.s)) + f"[{ctx}]"
+
+
+def _transition_text(tr: Transition) -> str:
+    guard = " & ".join(
+        sorted(" | ".join(sorted(map(str, disj))) for disj in tr.guard.expr)
+    )
+    post = " + ".join(
+        sorted(
+            f"{p!r}:{_state_text(s_)}/{','.join(sorted(map(str, upd.expr)))}"
+            for (s_, upd), p in tr.post.items()
+        )
+    )
+    return f"[{tr.action}] {_state_text(tr.pre)} & {guard} -> {post}"
@@ -0,0 +1,232 @@
+"""The exploration context shared between a search and its set method"""
+
+from inspect import signature
+
+from .types import (
+    MarkovDecisionProcess as MDP,
+    SetMethod,
+    State,
+    Transition,
+)
+from .model import Op
+
+# Variables used by a single process, by several processes without being
+# written, and written by one process while used by another
+LOCAL = "local"
+READ_SHARED = "read-shared"
+WRITE_SHARED = "write-shared"
+
+
+def variable_ownership(mdp: MDP) -> dict[str, str]:
+    """Classifies the variables of an MDP by the processes using them"""
+    users, written = {v: set() for v in mdp.init.ctx}, set()
+    for t in mdp.transitions:
+        for op in t.used():
+            users.setdefault(op.left, set()).update(t.active)
+            if "w" in op.rw:
+                written.add(op.left)
+    return {
+        v: (
+            LOCAL
+            if len(processes) <= 1
+            else WRITE_SHARED if v in written else READ_SHARED
+        )
+        for v, processes in users.items()
+    }
+
+
+class DependencyTables:
+    """Static relations between the transitions of an MDP, each computed once
+    when it is first needed. Parallel transitions can only depend on each other
+    through write-shared variables, other operations are not compared.
+    """
+
+    def __init__(self, mdp: MDP):
+        self.mdp = mdp
+        self._ownership = None
+        self._shared = {}
+        self._conflicting = {}
+        self._dependent = {}
+        self._interaction_graph = None
+
+    @property
+    def ownership(self) -> dict[str, str]:
+        """The class of each variable, see `variable_ownership`"""
+        if self._ownership is None:
+            self._ownership = variable_ownership(self.mdp)
+        return self._ownership
+
+    def shared(self, t: Transition) -> frozenset[Op]:
+        """The operations of t on write-shared variables, the only ones that
+        can make t dependent on a parallel transition
+        """
+        if t not in self._shared:
+            self._shared[t] = frozenset(
+                op
+                for op in t.used()
+                if self.ownership.get(op.left) == WRITE_SHARED
+            )
+        return self._shared[t]
+
+    def can_be_dependent(self, t1: Transition, t2: Transition) -> bool:
+        """t and t' are parallel and can-be-dependent"""
+        ops1, ops2 = self.shared(t1), self.shared(t2)
+        return (
+            bool(ops1 and ops2)
+            and t1.is_parallel(t2)
+            and any(op1.can_be_dependent(op2) for op1 in ops1 for op2 in ops2)
+        )
+
+    def do_not_accord(self, t1: Transition, t2: Transition) -> bool:
+        """t and t' are parallel and their operations do-not-accord"""
+        ops1, ops2 = self.shared(t1), self.shared(t2)
+        return (
+            bool(ops1 and ops2)
+            and t1.is_parallel(t2)
+            and any(op1.do_not_accord(op2) for op1 in ops1 for op2 in ops2)
+        )
+
+    def conflicting(self, t1: Transition) -> frozenset[Transition]:
+        """Transitions t' such that t and t' are in conflict, or parallel and
+        can-be-dependent
+        """
+        if t1 not in self._conflicting:
+            self._conflicting[t1] = frozenset(
+                t2
+                for t2 in self.mdp.transitions
+                if t1.in_conflict(t2) or self.can_be_dependent(t1, t2)
+            )
+        return self._conflicting[t1]
+
+    def dependent(self, t1: Transition) -> frozenset[Transition]:
+        """Transitions t' such that t and t' are in conflict, or parallel and
+        their operations do-not-accord
+        """
+        if t1 not in self._dependent:
+            self._dependent[t1] = frozenset(
+                t2
+                for t2 in self.mdp.transitions
+                if t1.in_conflict(t2) or self.do_not_accord(t1, t2)
+            )
+        return self._dependent[t1]
+
+    @property
+    def interaction_graph(self) -> dict[str, dict[MDP, Transition]]:
+        """Maps each local state s(i) to the processes Pj linked to it, i.e. for
+        some transition t such that s(i) ∈ pre(t), either Pj ∈ active(t), or
+        Pj ∈ active(t') for some t' such that t and t' are parallel and
+        can-be-dependent. The transition t is kept for logging.
+        """
+        if self._interaction_graph is None:
+            graph = {}
+            for t1 in self.mdp.transitions:
+                linked = list(t1.active)
+                for t2 in self.mdp.transitions:
+                    if self.can_be_dependent(t1, t2):
+                        linked += t2.active
+                for s_i in t1.pre:
+                    adjacent = graph.setdefault(s_i, {})
+                    for Pj in linked:
+                        adjacent.setdefault(Pj, t1)
+            self._interaction_graph = graph
+        return self._interaction_graph
+
+
+def dependency_tables(mdp: MDP) -> DependencyTables:
+    """Returns the dependency tables of an MDP, shared by all its states. They
+    are stored on the MDP, as they refer to it, and are freed with it.
+    """
+    tables = getattr(mdp, "_dependency_tables", None)
+    if tables is None:
+        tables = mdp._dependency_tables = DependencyTables(mdp)
+    return tables
+
+
+class Context:
+    """The context of a state being explored. Passed to set methods that take a
+    `ctx` argument, so that the enabled transitions computed by the search are
+    reused, enabledness checks are cached, and the dependency tables are
+    shared between states. `checks` counts the enabledness checks that were
+    not cached. A set method with a `cycle_proviso` may set `cycle_proviso` to
+    tell whether the proviso applies to the set it returned for s.
+    """
+
+    def __init__(self, mdp: MDP, s: State, enabled: list[Transition] = None):
+        self.mdp = mdp
+        self.s = s
+        self.checks = 0
+        self.cycle_proviso = None
+        self._enabled = None
+        self._enabledness = {}
+        if enabled is not None:
+            self._set_enabled(enabled)
+
+    @property
+    def enabled(self) -> list[Transition]:
+        """The transitions enabled in s"""
+        if self._enabled is None:
+            self.checks += len(self.mdp.transitions)
+            self._set_enabled(self.mdp.enabled(self.s))
+        return list(self._enabled)
+
+    def is_enabled(self, t: Transition) -> bool:
+        """Whether t is enabled in s"""
+        if t not in self._enabledness:
+            if self._enabled is not None:
+                return False
+            self.checks += 1
+            self._enabledness[t] = t.is_enabled(self.s)
+        return self._enabledness[t]
+
+    def take_one(self) -> Transition:
+        """Returns the first enabled transition in s"""
+        if self._enabled is not None:
+            return next(iter(self._enabled), None)
+        return next(filter(self.is_enabled, self.mdp.transitions), None)
+
+    @property
+    def tables(self) -> DependencyTables:
+        return dependency_tables(self.mdp)
+
+    def _set_enabled(self, enabled: list[Transition]):
+        self._enabled = tuple(enabled)
+        self._enabledness = dict.fromkeys(self._enabled, True)
+
+
+def with_context(set_method: SetMethod) -> SetMethod:
+    """Adapts a set method to be called as `set_method(mdp, s, t, ctx=ctx)`.
+    Set methods without a `ctx` argument are called as before, without `t` if
+    it is not given.
+    """
+    if not callable(set_method) or uses_context(set_method):
+        return set_method
+
+    def algo(
+        mdp: MDP, s: State, t: Transition = None, ctx: Context = None
+    ) -> list[Transition]:
+        if t is None:
+            return set_method(mdp, s)
+        return set_method(mdp, s, t)
+
+    algo.__name__ = getattr(set_method, "__name__", "set_method")
+    algo.cycle_proviso = getattr(set_method, "cycle_proviso", False)
+    return algo
+
+
+def uses_context(set_method: SetMethod) -> bool:
+    """Whether the set method takes a `ctx` argument"""
+    try:
+        return "ctx" in signature(set_method).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def accepts_seed(set_method: SetMethod) -> bool:
+    """Whether the set method takes a seed transition `t`, e.g. to be biased
+    with `transition_bias`
+    """
+    try:
+        parameters = signature(set_method).parameters
+    except (TypeError, ValueError):
+        return False
+    return len([p for p in parameters if p != "ctx"]) >= 3
@@ -0,0 +1,318 @@
+"""Estimation of the size of a state space by sampling, before exploring it,
+and the choice of the visited set able to hold it
+"""
+
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+
+from .types import (
+    MarkovDecisionProcess as MDP,
+    dataclass,
+    imdict,
+)
+from .model import State
+from .search import Budget, bfs
+from .utils import available_memory, logger, log_info_enabled
+from .visited import (
+    BitstateHashing,
+    DiskVisitedSet,
+    HashCompaction,
+    VisitedSet,
+    pack_state,
+)
+
+# The search modes, by the visited set they use
+MEMORY = "memory"
+DISK = "disk"
+APPROXIMATE = "approximate"
+
+# Bytes per state of a `HashCompaction` table sized for the states, at most
+# twice 8 / `max_load` as its size is rounded up to a power of two, and the
+# overhead per state of a `DiskVisitedSet` on top of the packed state
+_FINGERPRINT_BYTES = 18
+_DISK_OVERHEAD = 64
+# The memory assumed when the available memory cannot be determined
+_DEFAULT_MEMORY = 2**30
+
+
+@dataclass
+class Estimate:
+    """An estimate of the number of reachable states and of transitions taken
+    from them, `method` is either "exhaustive" (the counts are exact),
+    "collisions" or "knuth". `state_bytes` is the memory used by a state stored
+    in a `VisitedSet`, and `packed_bytes` its size in a `DiskVisitedSet`.
+    """
+
+    states: float
+    transitions: float
+    method: str
+    samples: int = 0
+    collisions: int = 0
+    depth: int = 0
+    state_bytes: float = 0.0
+    packed_bytes: float = 0.0
+    elapsed: float = 0.0
+
+    @property
+    def exact(self) -> bool:
+        return self.method == "exhaustive"
+
+
+def estimate(
+    mdp: MDP,
+    s: State = None,
+    timeout: float = 1.0,
+    exact_states: int = 4096,
+    probes: int = 64,
+    samples: int = 2048,
+    seed: int = None,
+) -> Estimate:
+    """Estimates the size of the full (unreduced) state space reachable from s.
+
+    The state space is first explored breadth-first for up to `exact_states`
+    states, and the exact counts are returned if it is complete. Otherwise, the
+    end states of up to `samples` random walks, of random length up to twice
+    the depth reached, are counted. From the number of states reached once (f1)
+    and twice (f2), the Chao1 estimate S + f1(f1 - 1) / 2(f2 + 1) corrects the
+    number S of distinct end states for the ones that were missed. Walks favour
+    some states, e.g. near the initial one, so it is rather an underestimate.
+
+    If no two walks end in the same state, the state space is much larger than
+    the number of samples, and Knuth's estimate [knuth1975] of the size of the
+    tree of paths without repeated states is used instead, from `probes`
+    random paths. A state is counted once per path to it, so it is an
+    overestimate.
+
+    Each step is stopped after its share of the `timeout` (in seconds), the
+    estimate is then made from the samples taken so far.
+    """
+    start = time.monotonic()
+    rng = random.Random(seed)
+    if s is None:
+        s = mdp.init
+
+    visited, transitions, depth, complete = _partial_bfs(
+        mdp, s, exact_states, timeout / 4
+    )
+    if complete:
+        return Estimate(
+            len(visited),
+            transitions,
+            "exhaustive",
+            samples=len(visited),
+            depth=depth,
+            state_bytes=_state_bytes(visited),
+            packed_bytes=_packed_bytes(visited),
+            elapsed=time.monotonic() - start,
+        )
+
+    deadline = start + 3 * timeout / 4
+    ends = Counter()
+    enabled = 0
+    for _ in range(samples):
+        if ends and time.monotonic() >= deadline:
+            break
+        end = _walk(mdp, s, rng.randint(0, 2 * depth), rng)
+        ends[end] += 1
+        enabled += len(mdp.enabled(end))
+    n = sum(ends.values())
+    collisions = sum(c * (c - 1) // 2 for c in ends.values())
+    f = Counter(ends.values())
+    states = max(
+        len(ends) + f[1] * (f[1] - 1) / (2 * (f[2] + 1)), len(visited)
+    )
+    transitions = states * enabled / n
+    method = "collisions"
+
+    if not collisions:
+        tree, tree_transitions = _knuth(mdp, s, probes, rng, start + timeout)
+        if tree > states:
+            states, transitions, method = tree, tree_transitions, "knuth"
+
+    sample = list(ends)
+    est = Estimate(
+        states,
+        transitions,
+        method,
+        samples=n,
+        collisions=collisions,
+        depth=depth,
+        state_bytes=_state_bytes(sample),
+        packed_bytes=_packed_bytes(sample),
+        elapsed=time.monotonic() - start,
+    )
+    _log_estimate(mdp, est)
+    return est
+
+
+def choose_mode(
+    est: Estimate, memory: int = None, disk: int = None, headroom: float = 0.5
+) -> str:
+    """Chooses how to store the visited states: in memory if they fit in a
+    fraction `headroom` of the `memory` (by default the available memory),
+    otherwise on `disk` (by default the free space of the temporary directory)
+    if they fit there, otherwise as fingerprints or bits (approximate).
+    """
+    if memory is None:
+        memory = available_memory() or _DEFAULT_MEMORY
+    if disk is None:
+        disk = shutil.disk_usage(tempfile.gettempdir()).free
+    if est.states * est.state_bytes <= headroom * memory:
+        return MEMORY
+    if est.states * (est.packed_bytes + _DISK_OVERHEAD) <= headroom * disk:
+        return DISK
+    return APPROXIMATE
+
+
+def visited_set(
+    mode: str, est: Estimate, memory: int = None, path: str = None
+) -> VisitedSet:
+    """Returns the visited set of a search mode, sized for the estimate. In the
+    approximate mode, a `HashCompaction` is used if its fingerprints fit in the
+    `memory` (by default the available memory), a `BitstateHashing` using half
+    of it otherwise.
+    """
+    if mode == MEMORY:
+        return VisitedSet()
+    if mode == DISK:
+        return DiskVisitedSet(path)
+    if mode != APPROXIMATE:
+        raise ValueError(f"Unknown search mode '{mode}'")
+    if memory is None:
+        memory = available_memory() or _DEFAULT_MEMORY
+    if est.states * _FINGERPRINT_BYTES <= memory / 2:
+        return HashCompaction(int(est.states))
+    return BitstateHashing(max(int(memory) * 4, 2**10))
+
+
+def auto_visited(
+    mdp: MDP, s: State = None, memory: int = None, path: str = None, **kw
+) -> VisitedSet:
+    """Estimates the state space of an MDP (see `estimate`, which gets the other
+    keyword arguments) and returns a visited set able to hold it. The caller
+    owns the set and closes it, removing the files of a `DiskVisitedSet`.
+    """
+    est = estimate(mdp, s, **kw)
+    mode = choose_mode(est, memory)
+    if log_info_enabled():
+        logger.info("visited set: %s", mode)
+    return visited_set(mode, est, memory, path)
+
+
+def _partial_bfs(
+    mdp: MDP, s: State, max_states: int, timeout: float
+) -> tuple[list[State], int, int, bool]:
+    """Explores up to `max_states` states breadth-first, returns them with the
+    number of transitions taken, the depth reached and whether the state space
+    was fully explored
+    """
+    generator = bfs(
+        mdp,
+        s,
+        set_method=False,
+        silent=True,
+        budget=Budget(max_states=max_states + 1, timeout=timeout),
+    )
+    visited, transitions, depth = [], 0, 0
+    while True:
+        try:
+            s_, act, level = next(generator)
+        except StopIteration as stop:
+            return visited, transitions, depth, stop.value.complete
+        visited.append(s_)
+        transitions += len(act)
+        depth = max(depth, level)
+
+
+def _knuth(
+    mdp: MDP, s: State, probes: int, rng: random.Random, deadline: float
+) -> tuple[float, float]:
+    """Knuth's estimator on the tree of paths without repeated states: along a
+    random path, the product of the branching factors estimates the number of
+    nodes at each depth. Returns the mean numbers of nodes and of transitions.
+    """
+    states = transitions = 0.0
+    done = 0
+    for _ in range(probes):
+        if done and time.monotonic() >= deadline:
+            break
+        s_ = s
+        path = {s_}
+        weight = 1.0
+        states += 1
+        while True:
+            enabled = mdp.enabled(s_)
+            transitions += weight * len(enabled)
+            successors = list(
+                {
+                    succ: None
+                    for tr in enabled
+                    for succ in tr.successors(s_)
+                    if succ not in path
+                }
+            )
+            if not successors:
+                break
+            weight *= len(successors)
+            states += weight
+            s_ = rng.choice(successors)
+            path.add(s_)
+        done += 1
+    return states / done, transitions / done
+
+
+def _walk(mdp: MDP, s: State, length: int, rng: random.Random) -> State:
+    """Takes `length` random steps from s, restarting from s in deadlocks so
+    that they do not absorb the walks
+    """
+    s_ = s
+    for _ in range(length):
+        enabled = mdp.enabled(s_)
+        if not enabled:
+            s_ = s
+            continue
+        successors = rng.choice(enabled).successors(s_)
+        s_ = rng.choices(list(successors), list(successors.values()))[0]
+    return s_
+
+
+def _state_bytes(states: list[State], n: int = 256) -> float:
+    """Measures the memory used by copies of the states in a `VisitedSet`"""
+    states = states[:n]
+    if not states:
+        return 0.0
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        visited = VisitedSet()
+        for s in states:
+            visited.add(State(frozenset(s.s), imdict(s.ctx)))
+        return (tracemalloc.get_traced_memory()[0] - before) / len(states)
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+
+def _packed_bytes(states: list[State], n: int = 256) -> float:
+    states = states[:n]
+    if not states:
+        return 0.0
+    return sum(len(pack_state(s)) for s in states) / len(states)
+
+
+def _log_estimate(mdp: MDP, est: Estimate):
+    if log_info_enabled():
+        logger.info(
+            "[%s] ~%.3g states, ~%.3g transitions (%s, %d samples)",
+            mdp.name,
+            est.states,
+            est.transitions,
+            est.method,
+            est.samples,
+        )
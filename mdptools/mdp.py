@@ -10,6 +10,7 @@ from .types import (
     Generator,
     Iterable,
     Iterator,
+    Callable,
 )
 from .utils import (
     operator,
@@ -26,9 +27,10 @@ from .model import (
     state,
     state_apply,
 )
-from .search import search, bfs
+from .search import search, bfs, explore, SearchResult
 from .graph import graph
 from .validate import validate
+from .bisimulation import quotient
 
 
 DEFAULT_NAME = "M"
@@ -127,6 +129,10 @@ class MarkovDecisionProcess:
         """Performs a breadth-first-search of the state space"""
         return bfs(self, s, **kw)
 
+    def explore(self, s: State = None, **kw) -> SearchResult:
+        """Explores the state space, optionally within a `Budget`"""
+        return explore(self, s, **kw)
+
     def rename(
         self,
         state_fn: RenameFunction = None,
@@ -150,6 +156,10 @@ class MarkovDecisionProcess:
             init=self.init.rename(states),
         )
 
+    def minimize(self, labels: Callable = None, **kw) -> "MDP":
+        """Returns the bisimulation quotient of the explored state space"""
+        return quotient(self, labels, **kw)
+
     def to_graph(self, file_path: str = None, **kw) -> Digraph:
         """Compiles the MDP to a Digraph using Graphviz"""
         return graph(self, file_path=file_path, **kw)
@@ -235,6 +245,33 @@ class MarkovDecisionProcess:
         self._actions = frozenset(actions)
 
 
+def compose(
+    *processes: MDP,
+    minimize: bool = False,
+    labels: Callable = None,
+    **kw,
+) -> MDP:
+    """Composes processes in parallel. With `minimize`, each process is first
+    replaced by its bisimulation quotient (with all actions kept visible), which
+    is preserved by the composition. Processes that use variables are shared
+    with the rest of the system and are therefore left unchanged.
+    """
+    if minimize:
+        processes = [_minimize_process(p, labels) for p in processes]
+    return MarkovDecisionProcess(*processes, **kw)
+
+
+def _minimize_process(p: MDP, labels: Callable) -> MDP:
+    if not isinstance(p, MarkovDecisionProcess) or not p.is_process:
+        return p
+    if any(tr.used() for tr in p.transitions) or p.init.ctx:
+        return p
+    q = quotient(p, labels, name=p.name)
+    if len(q.states) < len(p.states):
+        return q
+    return p
+
+
 @dataclass(eq=True, frozen=True)
 class _MDP:
     name: str
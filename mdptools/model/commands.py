@@ -24,6 +24,17 @@ class Op:
         # Check if one operation has a write while the other is nonempty
         return ("w" in self.rw and other.rw) or ("w" in other.rw and self.rw)
 
+    def do_not_accord(self, other: "Op") -> bool:
+        """Two writes accord if they assign the same value, and a write accords
+        with a read if the written value satisfies the read comparison
+        """
+        if not self.can_be_dependent(other):
+            return False
+        if "w" in self.rw and "w" in other.rw:
+            return self.right != other.right
+        write, read = (self, other) if "w" in self.rw else (other, self)
+        return not read({read.left: int(write.right)})
+
     def __repr__(self) -> str:
         return f"{self.left}{self.op}{self.right}"
 
@@ -59,6 +59,15 @@ class Transition:
             op1.can_be_dependent(op2) for op1 in used for op2 in other_used
         )
 
+    def do_not_accord(self, other: "Transition") -> bool:
+        """There exists a pair op1 in used(t1) and op2 in used(t2) such that
+        op1 and op2 do-not-accord
+        """
+        used, other_used = self.used(), other.used()
+        return any(
+            op1.do_not_accord(op2) for op1 in used for op2 in other_used
+        )
+
     def successors(self, s: State) -> dict[State, float]:
         """Return the possible successors after taking the transition in state `s`"""
         if not self.is_enabled(s):
@@ -0,0 +1,124 @@
+"""Goal-directed searches, stopping at the first state that satisfies a
+predicate and returning a witness trace from the initial state
+"""
+
+from array import array
+from queue import Queue, SimpleQueue
+
+from .types import (
+    MarkovDecisionProcess as MDP,
+    Action,
+    Callable,
+    SetMethod,
+    State,
+    Transition,
+    dataclass,
+)
+from .set_methods import stubborn_sets
+from .context import Context, with_context
+from .utils import id_register
+
+
+@dataclass(frozen=True)
+class Witness:
+    """A path from the initial state to a state satisfying the predicate"""
+
+    state: State
+    trace: tuple[Action]
+    path: tuple[State]
+
+    def __len__(self) -> int:
+        return len(self.trace)
+
+
+def reachable(
+    mdp: MDP,
+    predicate: Callable[[State], bool],
+    s: State = None,
+    set_method: SetMethod = None,
+    queue: Queue = SimpleQueue,
+) -> Witness:
+    """Searches for a state satisfying `predicate`, stopping at the first hit.
+    Note that `set_method` must preserve the reachability of such states.
+
+    Returns:
+        Witness: the trace to the first state found, or None if unreachable
+    """
+    return _find(mdp, s, lambda s, _: predicate(s), set_method, queue)
+
+
+def find_deadlock(
+    mdp: MDP,
+    s: State = None,
+    set_method: SetMethod = stubborn_sets,
+    queue: Queue = SimpleQueue,
+) -> Witness:
+    """Searches for a state without enabled transitions, stopping at the first
+    hit. Stubborn sets preserve deadlocks and are used by default.
+
+    Returns:
+        Witness: the trace to the first deadlock found, or None if deadlock free
+    """
+    return _find(mdp, s, lambda _, trs: len(trs) == 0, set_method, queue)
+
+
+def _find(
+    mdp: MDP,
+    s: State,
+    hit: Callable[[State, list[Transition]], bool],
+    set_method: SetMethod,
+    queue: Queue,
+) -> Witness:
+    if set_method is None:
+        set_method = mdp.set_method
+    set_method = with_context(set_method)
+    if s is None:
+        s = mdp.init
+
+    action_id = id_register()
+    # States are numbered in order of discovery, parent pointers and the actions
+    # leading to each state are stored as integer arrays
+    ids = {s: 0}
+    states = [s]
+    parents = array("l", [-1])
+    actions = array("l", [-1])
+
+    queue = queue()
+    queue.put(0)
+
+    while not queue.empty():
+        i = queue.get()
+        s = states[i]
+        trs = mdp.enabled(s)
+        if hit(s, trs):
+            return _witness(i, states, parents, actions, action_id)
+        if isinstance(set_method, Callable) and len(trs) > 1:
+            trs = set_method(mdp, s, ctx=Context(mdp, s, trs))
+        for tr in trs:
+            for succ in tr.successors(s):
+                if succ in ids:
+                    continue
+                ids[succ] = len(states)
+                states.append(succ)
+                parents.append(i)
+                actions.append(action_id(tr.action))
+                queue.put(ids[succ])
+
+    return None
+
+
+def _witness(
+    i: int,
+    states: list[State],
+    parents: array,
+    actions: array,
+    action_id: Callable,
+) -> Witness:
+    _, register = action_id()
+    action_names = {uid: a for a, uid in register.items()}
+    trace, path = [], [states[i]]
+    while parents[i] != -1:
+        trace.append(action_names[actions[i]])
+        i = parents[i]
+        path.append(states[i])
+    return Witness(path[0], tuple(reversed(trace)), tuple(reversed(path)))
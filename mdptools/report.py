@@ -0,0 +1,250 @@
+"""Reduction-effectiveness report, exploring a model with each set method and
+tabulating the size of the reduced state space and the cost of exploring it
+"""
+
+import importlib
+import importlib.util
+import sys
+import time
+import tracemalloc
+from argparse import ArgumentParser, Namespace
+from os import path
+
+from .types import (
+    MarkovDecisionProcess as MDP,
+    Iterable,
+    SetMethod,
+    State,
+    Transition,
+    Union,
+    dataclass,
+)
+from .context import Context, accepts_seed, with_context
+from .search import explore
+from .set_methods import (
+    conflicting_transitions,
+    overmans_algorithm,
+    stubborn_sets,
+    ample_sets,
+    confluence,
+    transition_bias,
+)
+
+SET_METHODS = [
+    None,
+    conflicting_transitions,
+    overmans_algorithm,
+    stubborn_sets,
+    ample_sets,
+    confluence,
+]
+
+
+@dataclass
+class ReductionStats:
+    """The outcome of exploring a model with one set method, times are given in
+    seconds and `peak_memory` in bytes
+    """
+
+    name: str
+    states: int
+    transitions: int
+    elapsed: float
+    set_method_time: float
+    peak_memory: int
+    complete: bool
+
+
+def compare_set_methods(
+    mdp: MDP,
+    set_methods: Iterable[SetMethod] = None,
+    biased: bool = True,
+    memory: bool = True,
+    **kw,
+) -> list[ReductionStats]:
+    """Explores `mdp` with each set method (by default `SET_METHODS`), and with
+    `biased`, also with each set method taking a seed biased towards each
+    action. Other keyword arguments (e.g. a `budget`) are passed to `explore`.
+
+    With `memory`, each set method is explored a second time with `tracemalloc`
+    to measure the peak memory, so that the timings are not affected by it.
+    """
+    if set_methods is None:
+        set_methods = SET_METHODS
+    kw = {**kw, "silent": True}
+
+    stats = []
+    for name, set_method in _variants(mdp, set_methods, biased):
+        timed = _timed(set_method)
+        result = explore(mdp, set_method=_or_classic(timed), **kw)
+        peak_memory = _peak_memory(mdp, set_method, kw) if memory else 0
+        stats.append(
+            ReductionStats(
+                name,
+                result.states,
+                sum(map(len, result.transition_map.values())),
+                result.elapsed,
+                timed.elapsed if timed is not None else 0.0,
+                peak_memory,
+                result.complete,
+            )
+        )
+    return stats
+
+
+def format_report(stats: list[ReductionStats]) -> str:
+    """Formats the stats as a table, with the states relative to the first row"""
+    header = (
+        "set method",
+        "states",
+        "%",
+        "transitions",
+        "time (s)",
+        "set method (s)",
+        "peak memory (kB)",
+    )
+    full = stats[0].states if stats else 0
+    rows = [
+        (
+            row.name + ("" if row.complete else " *"),
+            str(row.states),
+            f"{100 * row.states / full:.1f}" if full else "-",
+            str(row.transitions),
+            f"{row.elapsed:.4f}",
+            f"{row.set_method_time:.4f}",
+            str(row.peak_memory // 1024),
+        )
+        for row in stats
+    ]
+    widths = [max(map(len, column)) for column in zip(header, *rows)]
+    lines = [
+        "  ".join(
+            cell.ljust(width) if i == 0 else cell.rjust(width)
+            for i, (cell, width) in enumerate(zip(line, widths))
+        )
+        for line in [header, *rows]
+    ]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
+
+
+def load_model(spec: str) -> MDP:
+    """Loads an MDP given as `file.py:name` or `module:name`, the name defaults
+    to the only MDP defined at the top level
+    """
+    from .mdp import MarkovDecisionProcess
+
+    target, _, name = spec.partition(":")
+    if target.endswith(".py"):
+        sys.path.append(path.dirname(path.abspath(target)))
+        module_spec = importlib.util.spec_from_file_location(
+            path.splitext(path.basename(target))[0], target
+        )
+        module = importlib.util.module_from_spec(module_spec)
+        module_spec.loader.exec_module(module)
+    else:
+        module = importlib.import_module(target)
+
+    if name:
+        return getattr(module, name)
+    models = [
+        v
+        for v in vars(module).values()
+        if isinstance(v, MarkovDecisionProcess)
+    ]
+    if len(models) != 1:
+        raise ValueError(
+            f"'{target}' defines {len(models)} MDPs, please name one"
+        )
+    return models[0]
+
+
+def main(args: Namespace):
+    mdp = load_model(args.model)
+    stats = compare_set_methods(
+        mdp, biased=not args.no_bias, memory=not args.no_memory
+    )
+    print(f"[{mdp.name}]")
+    print(format_report(stats))
+
+
+def _variants(
+    mdp: MDP, set_methods: Iterable[SetMethod], biased: bool
+) -> Iterable[tuple[str, SetMethod]]:
+    for set_method in set_methods:
+        name = _name(set_method)
+        yield name, set_method
+        if biased and set_method is not None and accepts_seed(set_method):
+            for action in sorted(mdp.actions):
+                yield (
+                    f"{name} [{action}]",
+                    transition_bias(set_method, action),
+                )
+
+
+def _timed(set_method: SetMethod) -> Union[SetMethod, None]:
+    """Wraps a set method to add up the time spent in it"""
+    if set_method is None:
+        return None
+    method = with_context(set_method)
+
+    def algo(
+        mdp: MDP, s: State, t: Transition = None, ctx: Context = None
+    ) -> list[Transition]:
+        start = time.perf_counter()
+        try:
+            return method(mdp, s, t, ctx=ctx)
+        finally:
+            algo.elapsed += time.perf_counter() - start
+
+    algo.__name__ = _name(set_method)
+    algo.cycle_proviso = getattr(set_method, "cycle_proviso", False)
+    algo.elapsed = 0.0
+    return algo
+
+
+def _peak_memory(mdp: MDP, set_method: SetMethod, kw: dict) -> int:
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        explore(mdp, set_method=_or_classic(set_method), **kw)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+
+def _or_classic(set_method: SetMethod) -> SetMethod:
+    # None would fall back to the set method of the MDP
+    return False if set_method is None else set_method
+
+
+def _name(set_method: SetMethod) -> str:
+    if set_method is None:
+        return "classic"
+    return getattr(set_method, "__name__", "set_method")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        prog="python -m mdptools.report",
+        description="Compare the reduction of each set method on a model",
+    )
+    parser.add_argument(
+        "model",
+        type=str,
+        help="the model to explore, as file.py:name or module:name",
+    )
+    parser.add_argument(
+        "--no-bias",
+        action="store_true",
+        help="skip the set methods biased towards each action",
+    )
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="skip measuring the peak memory",
+    )
+    main(parser.parse_args())
@@ -1,4 +1,8 @@
 import math
+from os import path
+import random
+import threading
+import time
 
 from .types import (
     MarkovDecisionProcess as MDP,
@@ -8,6 +12,11 @@ from .types import (
     Generator,
     Callable,
     Transition,
+    Hashable,
+    Iterable,
+    Union,
+    dataclass,
+    field,
 )
 from .utils import (
     logger,
@@ -15,10 +24,232 @@ from .utils import (
     highlight as _h,
     ordered_state_str,
     get_terminal_width,
+    format_str,
+    memory_usage,
+)
+from .visited import VisitedSet
+from .context import Context, with_context
+from .symmetry import Symmetry
+from .checkpoint import (
+    Checkpoint,
+    save_checkpoint,
+    load_checkpoint,
+    queue_items,
 )
 from queue import Queue, LifoQueue, SimpleQueue
 
 
+@dataclass
+class Budget:
+    """Resource limits for a search, `max_memory` is the resident set size in
+    bytes and `timeout` is given in seconds
+    """
+
+    max_states: int = None
+    max_depth: int = None
+    timeout: float = None
+    max_memory: int = None
+    # Number of states taken from the queue between each memory check
+    check_interval: int = 1024
+
+    def exceeded(self, states: int, elapsed: float, pops: int) -> str:
+        """Returns the name of the limit that has been hit, if any, after
+        `pops` states have been taken from the queue
+        """
+        if self.max_states is not None and states >= self.max_states:
+            return "max_states"
+        if self.timeout is not None and elapsed >= self.timeout:
+            return "timeout"
+        if (
+            self.max_memory is not None
+            and pops % self.check_interval == 0
+            and memory_usage() >= self.max_memory
+        ):
+            return "max_memory"
+        return None
+
+
+@dataclass
+class SearchResult:
+    """The outcome of a search, returned when the search generator stops"""
+
+    states: int = 0
+    limit: str = None
+    frontier: int = 0
+    elapsed: float = 0.0
+    transition_map: dict[State, ActionMap] = field(default_factory=dict)
+
+    @property
+    def complete(self) -> bool:
+        """Whether the whole (reduced) state space was explored"""
+        return self.limit is None
+
+
+class SearchListener:
+    """Receives the events of a search, subclasses override the events they
+    need. The search only emits events when listeners are attached.
+    """
+
+    def on_begin(self, mdp: MDP, s: State):
+        """The search starts from s"""
+
+    def on_visit(self, s: State, level: int, enabled: list[Transition]):
+        """s is explored, `enabled` is computed by checking every transition"""
+
+    def on_set_method(
+        self, ctx: Context, trs: list[Transition], elapsed: float
+    ):
+        """The set method returned `trs` in `ctx.s` after `elapsed` seconds"""
+
+    def on_fire(
+        self, s: State, tr: Transition, successors: dict[State, float]
+    ):
+        """tr is taken from s"""
+
+    def on_expand(self, s: State, fanout: int, frontier: int):
+        """The `fanout` successors of s are added, leaving `frontier` states in
+        the queue
+        """
+
+    def on_end(self, result: SearchResult):
+        """The search stops"""
+
+
+@dataclass
+class SearchStats(SearchListener):
+    """Counters of a search, attached as a listener. Times are given in seconds
+    and `fanout` maps numbers of successors to the number of states having it.
+    """
+
+    visits: int = 0
+    transitions: int = 0
+    enabled_checks: int = 0
+    set_method_calls: int = 0
+    set_method_time: float = 0.0
+    queue_high_water: int = 0
+    fanout: dict[int, int] = field(default_factory=dict)
+    # The number of transitions of the MDP, each one is checked in every state
+    _transitions: int = field(default=0, init=False, repr=False)
+
+    def on_begin(self, mdp: MDP, s: State):
+        self._transitions = len(mdp.transitions)
+
+    def on_visit(self, s: State, level: int, enabled: list[Transition]):
+        self.visits += 1
+        self.enabled_checks += self._transitions
+
+    def on_set_method(
+        self, ctx: Context, trs: list[Transition], elapsed: float
+    ):
+        self.set_method_calls += 1
+        self.set_method_time += elapsed
+        self.enabled_checks += ctx.checks
+
+    def on_fire(
+        self, s: State, tr: Transition, successors: dict[State, float]
+    ):
+        self.transitions += 1
+
+    def on_expand(self, s: State, fanout: int, frontier: int):
+        self.fanout[fanout] = self.fanout.get(fanout, 0) + 1
+        self.queue_high_water = max(self.queue_high_water, frontier)
+
+
+@dataclass
+class Progress:
+    """A snapshot of a running search, `memory` is the resident set size in
+    bytes and times are given in seconds
+    """
+
+    states: int
+    elapsed: float
+    level: int
+    frontier: int
+    memory: int
+    expected_states: int = None
+
+    @property
+    def states_per_sec(self) -> float:
+        return self.states / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> float:
+        """The remaining time, if the number of states is expected"""
+        if self.expected_states is None or not self.states_per_sec:
+            return None
+        remaining = max(self.expected_states - self.states, 0)
+        return remaining / self.states_per_sec
+
+
+class ProgressReporter(SearchListener):
+    """Calls `callback` with the `Progress` of the search every `interval`
+    seconds, and once more when it stops. The clock is read every `every`
+    visited states. The ETA is given when `expected_states` is, e.g. from an
+    estimate of the state space.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[Progress], None],
+        interval: float = 1.0,
+        expected_states: int = None,
+        every: int = 256,
+    ):
+        self.callback = callback
+        self.interval = interval
+        self.expected_states = expected_states
+        self.every = every
+        self._start = self._last = 0.0
+        self._states = self._level = self._frontier = 0
+
+    def on_begin(self, mdp: MDP, s: State):
+        self._start = self._last = time.monotonic()
+        self._states = self._level = self._frontier = 0
+
+    def on_visit(self, s: State, level: int, enabled: list[Transition]):
+        self._states += 1
+        self._level = level
+        if self._states % self.every == 0:
+            now = time.monotonic()
+            if now - self._last >= self.interval:
+                self._last = now
+                self.callback(self.progress(now))
+
+    def on_expand(self, s: State, fanout: int, frontier: int):
+        self._frontier = frontier
+
+    def on_end(self, result: SearchResult):
+        self._frontier = result.frontier
+        self.callback(self.progress(time.monotonic()))
+
+    def progress(self, now: float) -> Progress:
+        return Progress(
+            self._states,
+            now - self._start,
+            self._level,
+            self._frontier,
+            memory_usage(),
+            self.expected_states,
+        )
+
+
+class CancellationToken:
+    """Stops a search cooperatively, e.g. from another thread or a progress
+    callback. The search returns after the state being explored, as if a
+    budget limit was hit.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
 def search(
     mdp: MDP,
     s: State = None,
@@ -26,59 +257,403 @@ def search(
     include_level: bool = False,
     queue: Queue = LifoQueue,
     silent: bool = False,
-) -> Generator[tuple[State, ActionMap], None, None]:
+    visited: Union[VisitedSet, str] = VisitedSet,
+    seed: int = None,
+    budget: Budget = None,
+    checkpoint: str = None,
+    checkpoint_interval: float = 60.0,
+    resume: bool = False,
+    symmetry: Symmetry = None,
+    compress_tau: bool = False,
+    labels: Callable[[State], Hashable] = None,
+    sleep_sets: bool = False,
+    listeners: Iterable[SearchListener] = None,
+    cancel: CancellationToken = None,
+) -> Generator[tuple[State, ActionMap], None, SearchResult]:
     """Performs a classic search on an MDP, or optionally a selective search if
-    `set_method` is supplied
+    `set_method` is supplied.
+
+    The `visited` set (or class) decides how explored states are stored, e.g.
+    `HashCompaction` or `BitstateHashing` for approximate exploration of large
+    state spaces. If a `seed` is given, the successors of each state are
+    explored in a random order. With `visited="auto"`, the state space is
+    first estimated by sampling, and the visited set is chosen to hold it in
+    memory, on disk, or approximately (see `estimate.auto_visited`). A visited
+    set created by the search (e.g. a `DiskVisitedSet` and its temporary
+    files) is closed when the search stops, unless it is kept in a
+    `checkpoint`. A given instance is left open for the caller to close.
+
+    When a limit in the `budget` is hit, the search stops and returns a partial
+    `SearchResult` stating the limit and the number of distinct states left in
+    the frontier. States deeper than `max_depth` are left in the frontier while
+    the rest is explored.
+
+    If a `checkpoint` file is given, the frontier, the visited set and the
+    explored transitions are saved every `checkpoint_interval` seconds, and when
+    the search stops. With `resume`, the search continues from the checkpoint.
+
+    With a `symmetry`, only the representative of each orbit is explored, and
+    the probabilities of successors in the same orbit are added up.
+
+    With `compress_tau`, chains of deterministic internal steps (local `tau`
+    transitions without variables that are the only way out of their local
+    state) are taken as part of the step leading to them, as long as they do
+    not change the `labels` of the state. Intermediate states are not stored.
+
+    Set methods taking a `ctx` argument get a `Context` with the enabled
+    transitions of the state and the dependency tables of the MDP.
+
+    Set methods with a `cycle_proviso` (e.g. `ample_sets`) get every state that
+    closes a cycle fully expanded, using the DFS stack for a `LifoQueue` and the
+    visited set otherwise, unless the set method waives it for a state (see
+    `Context`).
+
+    With `sleep_sets`, transitions explored from a state are put to sleep in
+    the successors of its later transitions that are independent of them, and
+    are not explored there again. This composes with any `set_method` and
+    preserves the reachable states. A state that is reached again with fewer
+    sleeping transitions is yielded once more with the transitions woken up.
+
+    The `listeners` (e.g. `SearchStats`) receive the events of the search, the
+    set method is only timed when there are any. A `ProgressReporter` reports
+    the throughput of the search periodically.
+
+    When the `cancel` token is cancelled, the search stops and returns a
+    partial `SearchResult` with the limit "cancelled".
     """
     if set_method is None:
         set_method = mdp.set_method
+    set_method = with_context(set_method)
 
     queue = queue()
-    transition_map = {}
+    created = None
+    if visited == "auto":
+        from .estimate import auto_visited
+
+        visited = created = auto_visited(mdp, s, seed=seed)
+    elif isinstance(visited, type):
+        visited = created = visited()
+    rng = random.Random(seed) if seed is not None else None
+    result = SearchResult()
+    start = time.monotonic()
 
     if s is None:
         s = mdp.init
+    if symmetry is not None:
+        s = symmetry.canonical(s)
+    tau_steps = _tau_steps(mdp) if compress_tau else None
 
     _log_begin(mdp, s, set_method, silent)
+    listeners = tuple(listeners or ())
+    for listener in listeners:
+        listener.on_begin(mdp, s)
+
+    # Set methods with a cycle proviso need the states on the DFS stack, which
+    # are tracked by pushing a marker that is popped when backtracking
+    proviso = getattr(set_method, "cycle_proviso", False)
+    use_stack = proviso and isinstance(queue, LifoQueue)
+    on_stack = set()
+
+    # The sleep set of each reached state, and the transitions to explore when a
+    # visited state is reached again with a smaller sleep set
+    sleep = {} if sleep_sets else None
+    awake = {}
+
+    def fall_asleep(s: State, asleep: frozenset[Transition]) -> bool:
+        """Update the sleep set of s, returns whether s has to be (re)visited"""
+        if s not in sleep:
+            sleep[s] = asleep
+            return True
+        if sleep[s] <= asleep:
+            return False
+        if s in visited:
+            awake[s] = awake.get(s, frozenset()).union(sleep[s] - asleep)
+        sleep[s] &= asleep
+        return s in awake
 
-    # Add the initial state
-    queue.put((s, 0))
+    if resume and checkpoint is not None and path.exists(checkpoint):
+        # Continue from the saved frontier and visited set
+        saved = load_checkpoint(checkpoint, mdp)
+        visited = saved.visited
+        result.states = saved.states
+        result.transition_map = saved.transition_map
+        if sleep is not None and saved.sleep is not None:
+            sleep, awake = saved.sleep, saved.awake
+        for item in saved.frontier:
+            if item[1] is None:
+                on_stack.add(item[0])
+            queue.put(item)
+    else:
+        # Add the initial state
+        queue.put((s, 0))
+    last_checkpoint = start
+    pruned = []
+    pops = 0
 
-    while not queue.empty():
-        s, level = queue.get()
-        if s not in transition_map:
+    def save():
+        nonlocal last_checkpoint
+        last_checkpoint = time.monotonic()
+        save_checkpoint(
+            checkpoint,
+            mdp,
+            Checkpoint(
+                None,
+                queue_items(queue) + pruned,
+                visited,
+                result.transition_map,
+                result.states,
+                sleep,
+                awake,
+            ),
+        )
+
+    def expand(s: State, tr: Transition) -> dict[State, float]:
+        # Get the successor states for the transition
+        successors = tr.successors(s)
+        if tau_steps:
+            successors = _compress(successors, tau_steps, labels)
+        if symmetry is not None:
+            successors = symmetry.reduce(successors)
+        return successors
+
+    try:
+        while not queue.empty():
+            s, level = queue.get()
+            if level is None:
+                on_stack.discard(s)
+                continue
+            if budget is not None:
+                if budget.max_depth is not None and level > budget.max_depth:
+                    result.limit = "max_depth"
+                    pruned.append((s, level))
+                    continue
+                pops += 1
+                limit = budget.exceeded(
+                    result.states, time.monotonic() - start, pops
+                )
+                if limit is not None:
+                    result.limit = limit
+                    queue.put((s, level))
+                    break
+            if cancel is not None and cancel.cancelled:
+                result.limit = "cancelled"
+                queue.put((s, level))
+                break
             # Register the global state
-            transition_map[s] = {}
+            if visited.add(s):
+                result.states += 1
+                woken = None
+            elif s in awake:
+                # Revisited with a smaller sleep set, explore the woken transitions
+                woken = awake.pop(s)
+            else:
+                continue
+            act = {}
             # Check if s has enabled transitions
-            trs = mdp.enabled(s)
-            _log_visit(mdp, s, trs, set_method, level, silent)
+            trs = enabled = mdp.enabled(s)
+            if woken is None:
+                _log_visit(mdp, s, trs, set_method, level, silent)
+            if listeners:
+                for listener in listeners:
+                    listener.on_visit(s, level, enabled)
             # Apply set_method if available and more than one transition is enabled in s
+            needs_proviso = proviso
             if isinstance(set_method, Callable) and len(trs) > 1:
-                trs = set_method(mdp, s)
+                ctx = Context(mdp, s, enabled)
+                if listeners:
+                    set_method_start = time.perf_counter()
+                    trs = set_method(mdp, s, ctx=ctx)
+                    elapsed = time.perf_counter() - set_method_start
+                    for listener in listeners:
+                        listener.on_set_method(ctx, trs, elapsed)
+                else:
+                    trs = set_method(mdp, s, ctx=ctx)
+                if proviso and ctx.cycle_proviso is not None:
+                    needs_proviso = ctx.cycle_proviso
+            if sleep is not None:
+                asleep = sleep.setdefault(s, frozenset())
+                if woken is None:
+                    trs = [tr for tr in trs if tr not in asleep]
+                    enabled = [tr for tr in enabled if tr not in asleep]
+                else:
+                    trs = [tr for tr in trs if tr in woken]
+                    enabled = [tr for tr in enabled if tr in woken]
+            if rng is not None:
+                trs = rng.sample(trs, len(trs))
+            expanded = [(tr, expand(s, tr)) for tr in trs]
+            # s is on the stack before its successors are checked, so that a
+            # self-loop closes a cycle
+            if use_stack and woken is None:
+                on_stack.add(s)
+                queue.put((s, None))
+            # Fully expand s if the reduced set closes a cycle
+            if needs_proviso and len(trs) < len(enabled):
+                closes_cycle = on_stack if use_stack else visited
+                if any(
+                    succ in closes_cycle
+                    for _, successors in expanded
+                    for succ in successors
+                ):
+                    expanded = [(tr, expand(s, tr)) for tr in enabled]
             # Expand the transitions
-            for tr in trs:
-                # Get the successor states for the transition
-                successors = tr.successors(s)
-                transition_map[s][tr.action] = successors
+            done = []
+            for tr, successors in expanded:
+                act[tr.action] = successors
+                if listeners:
+                    for listener in listeners:
+                        listener.on_fire(s, tr, successors)
+                if sleep is not None:
+                    # Transitions explored before tr stay asleep in its successors
+                    # as long as they are independent of tr
+                    asleep_ = frozenset(
+                        t for t in asleep.union(done) if _independent(t, tr)
+                    )
+                    done.append(tr)
                 # Add the discovered states to the queue
                 for succ in successors.keys():
-                    queue.put((succ, level + 1))
+                    if sleep is None or fall_asleep(succ, asleep_):
+                        queue.put((succ, level + 1))
                 _log_enqueue(mdp, successors, silent)
+            if listeners:
+                fanout = sum(len(successors) for _, successors in expanded)
+                for listener in listeners:
+                    listener.on_expand(s, fanout, queue.qsize())
+
+            if checkpoint is not None:
+                result.transition_map.setdefault(s, {}).update(act)
+                if time.monotonic() - last_checkpoint >= checkpoint_interval:
+                    save()
 
-            ret = (s, transition_map[s])
+            ret = (s, act)
             if include_level:
                 ret = (*ret, level)
-            yield ret
+            try:
+                yield ret
+            except GeneratorExit:
+                # The search is consistent between states, save the progress
+                if checkpoint is not None:
+                    save()
+                raise
 
+        if result.limit is not None:
+            result.frontier = _frontier(
+                queue_items(queue) + pruned, visited, awake
+            )
+        if checkpoint is not None:
+            save()
+        result.elapsed = time.monotonic() - start
+        _log_end(visited, result, silent)
+        for listener in listeners:
+            listener.on_end(result)
+        return result
+    finally:
+        # A visited set created by the search is closed with it, unless it is
+        # saved in a checkpoint
+        if created is not None and (
+            checkpoint is None or created is not visited
+        ):
+            created.close()
 
-def bfs(
-    mdp: MDP, s: State = None, **kw
-) -> Generator[tuple[State, ActionMap, int], None, None,]:
+
+def bfs(mdp: MDP, s: State = None, **kw) -> Generator[
+    tuple[State, ActionMap, int],
+    None,
+    SearchResult,
+]:
     """Performs a breadth-first-search on an MDP"""
     kw = {"include_level": True, **kw, "queue": SimpleQueue}
     return search(mdp, s, **kw)
 
 
+def explore(mdp: MDP, s: State = None, **kw) -> SearchResult:
+    """Runs a search until it completes or its budget is exhausted,
+    collecting the explored transitions in the returned `SearchResult`
+    """
+    kw = {**kw, "include_level": False}
+    transition_map = {}
+    generator = search(mdp, s, **kw)
+    while True:
+        try:
+            s, act = next(generator)
+        except StopIteration as stop:
+            result: SearchResult = stop.value
+            break
+        # States may be yielded again with woken up transitions
+        transition_map.setdefault(s, {}).update(act)
+    result.transition_map.update(transition_map)
+    return result
+
+
+def _frontier(
+    items: list[tuple[State, int]], visited: VisitedSet, awake: dict
+) -> int:
+    """The number of distinct states left to explore, without the states that
+    were visited since they were queued and the DFS stack markers
+    """
+    return len(
+        {
+            s
+            for s, level in items
+            if level is not None and (s not in visited or s in awake)
+        }
+    )
+
+
+def _independent(t1: Transition, t2: Transition) -> bool:
+    """Whether two transitions enabled in the same state can be taken in either
+    order without disabling each other
+    """
+    return t1 != t2 and not t1.in_conflict(t2) and not t1.do_not_accord(t2)
+
+
+def _tau_steps(mdp: MDP) -> dict[str, Transition]:
+    """Map local states to the deterministic internal step leaving them"""
+    steps = {}
+    for tr in mdp.transitions:
+        if (
+            not tr.action.startswith("tau")
+            or len(tr.pre) != 1
+            or len(tr.post) != 1
+            or tr.used()
+            or next(iter(tr.post.values())) != 1
+        ):
+            continue
+        (local,) = tr.pre.s
+        if sum(local in t.pre for t in mdp.transitions) == 1:
+            steps[local] = tr
+    return steps
+
+
+def _compress(
+    dist: dict[State, float],
+    steps: dict[str, Transition],
+    labels: Callable[[State], Hashable],
+) -> dict[State, float]:
+    """Follow the chains of internal steps from each state in `dist`"""
+    ret = {}
+    for s, p in dist.items():
+        seen = {s}
+        label = labels(s) if labels is not None else None
+        while True:
+            s_next = next(
+                (
+                    s_next
+                    for ss in s.s
+                    if ss in steps
+                    for s_next in steps[ss].successors(s)
+                    if s_next not in seen
+                    and (labels is None or labels(s_next) == label)
+                ),
+                None,
+            )
+            if s_next is None:
+                break
+            seen.add(s_next)
+            s = s_next
+        ret[s] = ret.get(s, 0) + p
+    return ret
+
+
 def _log_begin(mdp: MDP, s: State, set_method: SetMethod, silent: bool):
     if not silent and log_info_enabled():
         line_width = get_terminal_width()
@@ -117,13 +692,19 @@ def _log_visit(
             _h.function("VISIT"),
             level,
             ordered_state_str(s, mdp, ",", lambda st: _h.state(st)),
-            f"\n-> <{next(iter(T))}>"
-            if len(T) == 1
-            else f" [{_h.error('DEADLOCK')}]"
-            if len(T) == 0
-            else "\n-> enabled(s)"
-            if not isinstance(set_method, Callable)
-            else "",
+            (
+                f"\n-> <{next(iter(T))}>"
+                if len(T) == 1
+                else (
+                    f" [{_h.error('DEADLOCK')}]"
+                    if len(T) == 0
+                    else (
+                        "\n-> enabled(s)"
+                        if not isinstance(set_method, Callable)
+                        else ""
+                    )
+                )
+            ),
         )
 
 
@@ -136,3 +717,20 @@ def _log_enqueue(mdp: MDP, successors: dict[State, float], silent: bool):
                 for s in successors.keys()
             ),
         )
+
+
+def _log_end(visited: VisitedSet, result: SearchResult, silent: bool):
+    if not silent and log_info_enabled():
+        logger.info(
+            "\n%s%s %s",
+            _h.ok("SEARCH ENDED"),
+            (
+                ""
+                if result.complete
+                else f" [{_h.error(result.limit)}, frontier={result.frontier}]"
+            ),
+            ", ".join(
+                f"{_h.variable(k)}={format_str(v, use_colors=False)}"
+                for k, v in visited.report().items()
+            ),
+        )
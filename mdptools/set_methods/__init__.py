@@ -2,3 +2,7 @@ from .transition_bias import transition_bias
 from .algorithm1_conflicting_transitions import conflicting_transitions
 from .algorithm2_overmans_algorithm import overmans_algorithm
 from .algorithm3_stubborn_sets import stubborn_sets
+from .algorithm4_ample_sets import ample_sets, visible_transitions
+from .smallest_set import smallest_set
+from .memoize import memoize
+from .confluence import confluence, confluence_reduction, confluent_transitions
@@ -1,5 +1,6 @@
 from mdptools.mdp import MarkovDecisionProcess
 from ..types import MarkovDecisionProcess as MDP, State, Transition
+from ..context import Context
 from ..utils import (
     highlight as _h,
     logger,
@@ -9,12 +10,14 @@ from ..utils import (
 
 
 def conflicting_transitions(
-    mdp: MDP, s: State, t: Transition = None
+    mdp: MDP, s: State, t: Transition = None, ctx: Context = None
 ) -> list[Transition]:
     """Algorithm 1 from [godefroid1996]"""
+    if ctx is None:
+        ctx = Context(mdp, s)
     # 1. Take one transition t that is enabled in s.
-    if t is None or not t.is_enabled(s):
-        t = mdp.enabled_take_one(s)
+    if t is None or not ctx.is_enabled(t):
+        t = ctx.take_one()
 
     # Let T = {t}.
     T = [t]
@@ -23,21 +26,18 @@ def conflicting_transitions(
 
     # 2. For all transitions t in T
     for t1 in T:
-        # add to T all transitions t' such that
+        # add to T all transitions t' such that t and t' are in conflict; or
+        # t and t' are parallel and can-be-dependent
+        conflicting = ctx.tables.conflicting(t1)
         for t2 in mdp.transitions:
             if t2 in T:
                 continue
-            # t and t' are in conflict; or
-            if t1.in_conflict(t2) or (
-                # t and t' are parallel and can-be-dependent
-                t1.is_parallel(t2)
-                and t1.can_be_dependent(t2)
-            ):
+            if t2 in conflicting:
                 _log_append(t1, t2, s)
                 # If a disabled transition is introduced,
-                if not t2.is_enabled(s):
+                if not ctx.is_enabled(t2):
                     # return all enabled transitions
-                    T = mdp.enabled(s)
+                    T = ctx.enabled
                     break
                 T.append(t2)
 
@@ -1,5 +1,6 @@
 from mdptools.utils.utils import ordered_state_str
-from ..types import MarkovDecisionProcess as MDP, State, Transition, Iterable
+from ..types import MarkovDecisionProcess as MDP, State, Transition
+from ..context import Context, dependency_tables
 from ..utils import (
     highlight as _h,
     logger,
@@ -9,33 +10,32 @@ from ..utils import (
 
 
 def overmans_algorithm(
-    mdp: MDP, s: State, t: Transition = None
+    mdp: MDP, s: State, t: Transition = None, ctx: Context = None
 ) -> list[Transition]:
     """Algorithm 2 from [godefroid1996]"""
+    if ctx is None:
+        ctx = Context(mdp, s)
     # 1. Take one transition t that is enabled in s
-    if t is None or not t.is_enabled(s):
-        t = mdp.enabled_take_one(s)
+    if t is None or not ctx.is_enabled(t):
+        t = ctx.take_one()
 
     # Let P = active(t)
     P = list(t.active)
 
     _log_begin(mdp, s, t, P)
 
-    # 2. For all processes Pi ∈ P
+    # 2. For all processes Pi ∈ P, add the processes linked to s(i)
+    graph = ctx.tables.interaction_graph
     for Pi in P:
-        # for all transitions t such that s(i) ∈ pre(t)
-        for t1 in _trs_local_state_in_pre(s, Pi, mdp):
-            for Pj in mdp.processes:
-                if Pj in P:
-                    continue
-                if Pj in t1.active or _active_in_dependent_tr(Pj, t1, mdp):
-                    P.append(Pj)
-                    _log_append(Pj, t1)
+        for Pj, t1 in graph.get(s(Pi), {}).items():
+            if Pj not in P:
+                P.append(Pj)
+                _log_append(Pj, t1)
 
     _P = set(P)
     # Return all transitions t such that active(t) ⊆ P and t is enabled in s
     T = list(
-        filter(lambda t: t.active <= _P and t.is_enabled(s), mdp.transitions)
+        filter(lambda t: t.active <= _P and ctx.is_enabled(t), mdp.transitions)
     )
 
     _log_end(T)
@@ -43,21 +43,11 @@ def overmans_algorithm(
     return T
 
 
-def _trs_local_state_in_pre(
-    s: State, p: MDP, mdp: MDP
-) -> Iterable[Transition]:
-    """Return transitions that can be accessed by process p from its current local state s(i)"""
-    s_i = s(p)
-    return filter(lambda t: s_i in t.pre, mdp.transitions)
-
-
-def _active_in_dependent_tr(p: MDP, t1: Transition, mdp: MDP) -> bool:
-    """p ∈ active(t') for some t' such that t and t' are parallel and can-be-dependent"""
-    return any(
-        p in t2.active
-        for t2 in mdp.transitions
-        if t1.is_parallel(t2) and t1.can_be_dependent(t2)
-    )
+def interaction_graph(mdp: MDP) -> dict[str, dict[MDP, Transition]]:
+    """Maps each local state s(i) to the processes Pj linked to it, built once
+    per MDP (see `DependencyTables.interaction_graph`)
+    """
+    return dependency_tables(mdp).interaction_graph
 
 
 def _log_begin(mdp: MDP, s: State, t: Transition, P: list[MDP]):
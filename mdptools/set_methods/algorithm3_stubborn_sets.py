@@ -1,5 +1,6 @@
 from mdptools.utils.utils import ordered_state_str
 from ..model.commands import Op
+from ..context import Context, DependencyTables
 from ..types import (
     MarkovDecisionProcess as MDP,
     State,
@@ -15,12 +16,14 @@ from ..utils import (
 
 
 def stubborn_sets(
-    mdp: MDP, s: State, t: Transition = None
+    mdp: MDP, s: State, t: Transition = None, ctx: Context = None
 ) -> list[Transition]:
     """Algorithm 3 from [godefroid1996]"""
+    if ctx is None:
+        ctx = Context(mdp, s)
     # 1. Take one transition t that is enabled in s.
-    if t is None or not t.is_enabled(s):
-        t = mdp.enabled_take_one(s)
+    if t is None or not ctx.is_enabled(t):
+        t = ctx.take_one()
 
     # Let Ts = {t}.
     Ts = [t]
@@ -39,7 +42,7 @@ def stubborn_sets(
     # 2. For all transitions t in Ts
     for t1 in Ts:
         # (a) if t is disabled in s, either
-        if not t1.is_enabled(s):
+        if not ctx.is_enabled(t1):
             # i. choose a process Pj ∈ active(t) such that s(j) != (pre(t) ∩ Pj)
             Pj = _choose_process(s, t1)
             if Pj is not None:
@@ -57,10 +60,10 @@ def stubborn_sets(
         else:
             # add to Ts all transitions t' such that t and t' are in conflict or
             # parallel and their operations do-not-accord
-            add_t(_cond_dependent(t1))
+            add_t(_cond_dependent(t1, ctx.tables))
 
     # Return all transitions in Ts that are enabled in s
-    T = list(filter(lambda t: t.is_enabled(s), Ts))
+    T = list(filter(ctx.is_enabled, Ts))
 
     _log_end(T)
 
@@ -101,12 +104,12 @@ def _cond_op_dependent(cj: frozenset[Op]) -> Callable[[Transition], bool]:
     return condition
 
 
-def _cond_dependent(t1: Transition) -> Callable[[Transition], bool]:
+def _cond_dependent(
+    t1: Transition, tables: DependencyTables
+) -> Callable[[Transition], bool]:
     """t and t' are in conflict or parallel and their operations do-not-accord"""
-    condition = lambda t2: t1.in_conflict(t2) or (
-        t1.is_parallel(t2)
-        and t1.can_be_dependent(t2)  # TODO implement do-not-accord
-    )
+    dependent = tables.dependent(t1)
+    condition = lambda t2: t2 in dependent
     condition.__name__ = (
         f"dependent with <{_h.action(t1.action)}> [{_h.error('rule b')}]"
     )
@@ -0,0 +1,107 @@
+from ..types import (
+    MarkovDecisionProcess as MDP,
+    State,
+    Transition,
+    Callable,
+    Iterable,
+    Union,
+)
+from ..utils import (
+    highlight as _h,
+    logger,
+    log_info_enabled,
+    ordered_state_str,
+)
+from ..context import Context
+from .algorithm3_stubborn_sets import stubborn_sets
+
+
+def ample_sets(
+    mdp: MDP,
+    s: State,
+    t: Transition = None,
+    visible: Callable[[Transition], bool] = None,
+    ctx: Context = None,
+) -> list[Transition]:
+    """Ample sets satisfying the conditions A1-A5 from [baier2004]
+
+    A1. ∅ != ample(s) ⊆ en(s)
+    A2. ample(s) is persistent (checked using stubborn sets)
+    A3. if ample(s) != en(s), all transitions in ample(s) are invisible
+    A4. every cycle in the reduced state space contains a fully expanded state
+        (the cycle proviso, enforced by `search` as `cycle_proviso` is set)
+    A5. if ample(s) != en(s), then ample(s) = {t}, meaning that probabilistic
+        transitions are only taken alone
+    """
+    if ctx is None:
+        ctx = Context(mdp, s)
+    enabled = ctx.enabled
+    # Try the preferred transition first
+    candidates = enabled
+    if t is not None and t in enabled:
+        candidates = [t] + [t1 for t1 in enabled if t1 != t]
+
+    _log_begin(mdp, s)
+
+    for t1 in candidates:
+        # A3. The transition must be invisible
+        if visible is not None and visible(t1):
+            _log_reject(t1, "visible")
+            continue
+        # A2 + A5. {t} is persistent if no other enabled transition is stubborn
+        if len(stubborn_sets(mdp, s, t1, ctx=ctx)) == 1:
+            _log_end([t1])
+            return [t1]
+        _log_reject(t1, "not persistent")
+
+    _log_end(enabled)
+
+    return enabled
+
+
+ample_sets.cycle_proviso = True
+
+
+def visible_transitions(
+    visible: Union[Callable[[Transition], bool], Iterable[str]],
+) -> Callable[[MDP, State, Transition], list[Transition]]:
+    """Ample sets where the transitions matching `visible` (a predicate, or a
+    collection of action names) are visible to the property
+    """
+    if not callable(visible):
+        actions = frozenset(visible)
+        visible = lambda t: t.action in actions
+
+    def algo(
+        mdp: MDP, s: State, t: Transition = None, ctx: Context = None
+    ) -> list[Transition]:
+        return ample_sets(mdp, s, t, visible, ctx)
+
+    algo.__name__ = ample_sets.__name__
+    algo.cycle_proviso = True
+    return algo
+
+
+def _log_begin(mdp: MDP, s: State):
+    if log_info_enabled():
+        logger.info(
+            "%s %s\n  s := {%s}",
+            _h.comment("begin"),
+            _h.function("ample_sets"),
+            ordered_state_str(s, mdp, ",", lambda st: _h.state(st)),
+        )
+
+
+def _log_reject(t: Transition, reason: str):
+    if log_info_enabled():
+        logger.info("     -  <%s> [%s]", t, _h.error(reason))
+
+
+def _log_end(T: list[Transition]):
+    if log_info_enabled():
+        logger.info(
+            "\n  %s {<%s>}\n%s",
+            _h.variable("return"),
+            ">,\n          <".join(map(str, T)),
+            _h.comment("end"),
+        )
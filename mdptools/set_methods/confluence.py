@@ -0,0 +1,136 @@
+from ..types import (
+    MarkovDecisionProcess as MDP,
+    SetMethod,
+    State,
+    Transition,
+    Callable,
+)
+from ..context import Context, dependency_tables, with_context
+from ..utils import (
+    highlight as _h,
+    logger,
+    log_info_enabled,
+    ordered_state_str,
+)
+
+
+def is_internal(t: Transition) -> bool:
+    """Transitions with a `tau` action are internal"""
+    return t.action.startswith("tau")
+
+
+def confluent_transitions(
+    mdp: MDP, internal: Callable[[Transition], bool] = None
+) -> frozenset[Transition]:
+    """Internal transitions with a single outcome of probability 1 that commute
+    with every other transition, i.e. they are not in conflict with any of them,
+    and their operations accord with those of the parallel ones. Taking such a
+    transition first leads to the same distributions in any state.
+    """
+    if internal is None:
+        # Cached on the MDP for the default `is_internal`
+        confluent = getattr(mdp, "_confluent_transitions", None)
+        if confluent is None:
+            confluent = confluent_transitions(mdp, is_internal)
+            mdp._confluent_transitions = confluent
+        return confluent
+
+    tables = dependency_tables(mdp)
+    return frozenset(
+        t
+        for t in mdp.transitions
+        if internal(t)
+        and len(t.post) == 1
+        and next(iter(t.post.values())) == 1
+        and tables.dependent(t) == {t}
+    )
+
+
+def confluence(
+    mdp: MDP, s: State, t: Transition = None, ctx: Context = None
+) -> list[Transition]:
+    """Confluence reduction: an enabled confluent transition (the given one if
+    possible) is taken alone, otherwise all enabled transitions are taken
+    """
+    if ctx is None:
+        ctx = Context(mdp, s)
+    return _prioritise(
+        mdp, s, t, ctx, confluent_transitions(mdp), lambda: ctx.enabled
+    )
+
+
+confluence.cycle_proviso = True
+
+
+def confluence_reduction(
+    set_method: SetMethod = None,
+    internal: Callable[[Transition], bool] = None,
+) -> SetMethod:
+    """Gives priority to confluent transitions, using `set_method` in states
+    without one (e.g. `stubborn_sets`, when confluence is found where the
+    stubborn sets contain all enabled transitions). The cycle proviso applies
+    to the states where a confluent transition is taken, and in the others
+    only if `set_method` has one.
+    """
+    method = with_context(set_method)
+
+    def algo(
+        mdp: MDP, s: State, t: Transition = None, ctx: Context = None
+    ) -> list[Transition]:
+        if ctx is None:
+            ctx = Context(mdp, s)
+
+        def fallback() -> list[Transition]:
+            ctx.cycle_proviso = getattr(method, "cycle_proviso", False)
+            if method is None:
+                return ctx.enabled
+            return method(mdp, s, t, ctx=ctx)
+
+        ctx.cycle_proviso = True
+        confluent = confluent_transitions(mdp, internal)
+        return _prioritise(mdp, s, t, ctx, confluent, fallback)
+
+    algo.__name__ = confluence.__name__
+    algo.cycle_proviso = True
+    return algo
+
+
+def _prioritise(
+    mdp: MDP,
+    s: State,
+    t: Transition,
+    ctx: Context,
+    confluent: frozenset[Transition],
+    fallback: Callable[[], list[Transition]],
+) -> list[Transition]:
+    _log_begin(mdp, s)
+    if t is not None and t in confluent and ctx.is_enabled(t):
+        _log_end([t])
+        return [t]
+    for t1 in ctx.enabled:
+        if t1 in confluent:
+            _log_end([t1])
+            return [t1]
+    T = fallback()
+    _log_end(T)
+    return T
+
+
+def _log_begin(mdp: MDP, s: State):
+    if log_info_enabled():
+        logger.info(
+            "%s %s\n  s := {%s}",
+            _h.comment("begin"),
+            _h.function("confluence"),
+            ordered_state_str(s, mdp, ",", lambda st: _h.state(st)),
+        )
+
+
+def _log_end(T: list[Transition]):
+    if log_info_enabled():
+        logger.info(
+            "\n  %s {<%s>}\n%s",
+            _h.variable("return"),
+            ">,\n          <".join(map(str, T)),
+            _h.comment("end"),
+        )
@@ -0,0 +1,161 @@
+from collections import OrderedDict
+
+from ..types import (
+    MarkovDecisionProcess as MDP,
+    SetMethod,
+    State,
+    Transition,
+    Callable,
+    dataclass,
+)
+from ..context import Context, WRITE_SHARED, dependency_tables, with_context
+from ..utils import highlight as _h, logger, log_info_enabled
+
+# Marks a cached result that contained every enabled transition
+_ENABLED = object()
+
+
+@dataclass(frozen=True)
+class CacheInfo:
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+def memoize(
+    set_method: Callable[[MDP, State, Transition], list[Transition]],
+    maxsize: int = 2**16,
+) -> SetMethod:
+    """Caches the sets of `set_method` under the projection of the state onto
+    the part of the model the set can depend on, evicting the least recently
+    used entries beyond `maxsize`.
+
+    The seed (the first enabled transition, unless one is given) is passed to
+    `set_method` explicitly. Starting from the seed, transitions sharing a local
+    state or a write-shared variable are linked, and only the local states and variables of
+    the linked transitions are kept in the key. Sets containing transitions
+    outside of them are not cached, unless they are all the enabled ones.
+    """
+    method = with_context(set_method)
+    cache = OrderedDict()
+    components = _Components()
+
+    def algo(
+        mdp: MDP, s: State, t: Transition = None, ctx: Context = None
+    ) -> list[Transition]:
+        if ctx is None:
+            ctx = Context(mdp, s)
+        if t is None:
+            t = ctx.take_one()
+        if t is None:
+            return method(mdp, s, ctx=ctx)
+        local_states, variables, transitions = components(mdp, t)
+        key = (
+            t,
+            local_states.intersection(s.s),
+            tuple(s.ctx.get(v) for v in variables),
+        )
+        if key in cache:
+            cache.move_to_end(key)
+            algo.hits += 1
+            T = cache[key]
+            return ctx.enabled if T is _ENABLED else list(T)
+        algo.misses += 1
+
+        T = method(mdp, s, t, ctx=ctx)
+        if all(t1 in transitions for t1 in T):
+            cache[key] = tuple(T)
+        elif len(T) == len(ctx.enabled):
+            cache[key] = _ENABLED
+        else:
+            _log_uncached(t)
+            return T
+        if len(cache) > maxsize:
+            cache.popitem(last=False)
+        return T
+
+    def cache_info() -> CacheInfo:
+        return CacheInfo(algo.hits, algo.misses, maxsize, len(cache))
+
+    def cache_clear():
+        cache.clear()
+        algo.hits = algo.misses = 0
+
+    algo.__name__ = set_method.__name__
+    algo.cycle_proviso = getattr(set_method, "cycle_proviso", False)
+    algo.hits = algo.misses = 0
+    algo.cache_info = cache_info
+    algo.cache_clear = cache_clear
+    return algo
+
+
+class _Components:
+    """The transitions linked to each transition through shared local states
+    or write-shared variables, computed once per MDP
+    """
+
+    def __init__(self):
+        self._mdp = None
+        self._components = {}
+
+    def __call__(
+        self, mdp: MDP, t: Transition
+    ) -> tuple[frozenset[str], tuple[str], frozenset[Transition]]:
+        if mdp is not self._mdp:
+            self._mdp = mdp
+            self._components = _components(mdp)
+        return self._components[t]
+
+
+def _components(mdp: MDP) -> dict[Transition, tuple]:
+    transitions = list(mdp.transitions)
+    parent = list(range(len(transitions)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # Link the transitions sharing a local state or a write-shared variable,
+    # other variables are either constant or used by a single process
+    ownership = dependency_tables(mdp).ownership
+    names = [_names(t) for t in transitions]
+    owner = {}
+    for i, (local_states, variables) in enumerate(names):
+        shared = (v for v in variables if ownership.get(v) == WRITE_SHARED)
+        for name in local_states.union(shared):
+            j = owner.setdefault(name, i)
+            parent[find(i)] = find(j)
+
+    groups = {}
+    for i, t in enumerate(transitions):
+        groups.setdefault(find(i), []).append(i)
+    components = {}
+    for group in groups.values():
+        local_states = frozenset().union(*(names[i][0] for i in group))
+        variables = tuple(sorted(set().union(*(names[i][1] for i in group))))
+        trs = frozenset(transitions[i] for i in group)
+        for i in group:
+            components[transitions[i]] = (local_states, variables, trs)
+    return components
+
+
+def _names(t: Transition) -> tuple[frozenset[str], frozenset[str]]:
+    local_states = set(t.pre.s)
+    for s_, _ in t.post.keys():
+        local_states.update(s_.s)
+    return frozenset(local_states), frozenset(op.left for op in t.used())
+
+
+def _log_uncached(t: Transition):
+    if log_info_enabled():
+        logger.info(
+            "%s <%s> [%s]", _h.comment("memoize"), t, _h.error("not cached")
+        )
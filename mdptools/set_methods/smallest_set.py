@@ -0,0 +1,78 @@
+from ..types import (
+    MarkovDecisionProcess as MDP,
+    SetMethod,
+    State,
+    Transition,
+    Callable,
+    Iterable,
+)
+from ..context import Context, with_context
+from ..utils import highlight as _h, logger, log_info_enabled
+
+
+def smallest_set(
+    set_method: Callable[[MDP, State, Transition], list[Transition]],
+    seeds: Callable[[list[Transition]], Iterable[Transition]] = None,
+    cache_size: int = 2**16,
+) -> SetMethod:
+    """Computes the set of `set_method` for each seed transition returned by
+    `seeds` (by default one enabled transition per distinct pre-state, as the
+    transitions in conflict with the seed end up in the same set), and returns
+    the smallest one.
+
+    Any seed gives a valid set, so the best seed is cached under the enabled
+    transitions of the state, and states with the same enabled transitions
+    only compute the set of that seed.
+    """
+    if seeds is None:
+        seeds = _distinct_pre
+    method = with_context(set_method)
+    cache = {}
+
+    def algo(
+        mdp: MDP, s: State, t: Transition = None, ctx: Context = None
+    ) -> list[Transition]:
+        if ctx is None:
+            ctx = Context(mdp, s)
+        if t is not None:
+            return method(mdp, s, t, ctx=ctx)
+        enabled = ctx.enabled
+        key = frozenset(enabled)
+        if key in cache:
+            algo.hits += 1
+            return method(mdp, s, cache[key], ctx=ctx)
+        algo.misses += 1
+
+        best, best_seed = None, None
+        for seed in seeds(enabled):
+            T = method(mdp, s, seed, ctx=ctx)
+            if best is None or len(T) < len(best):
+                best, best_seed = T, seed
+                if len(best) == 1:
+                    break
+        if best is None:
+            return enabled
+
+        if len(cache) >= cache_size:
+            cache.clear()
+        cache[key] = best_seed
+        _log_seed(best_seed, best)
+        return best
+
+    algo.__name__ = set_method.__name__
+    algo.cycle_proviso = getattr(set_method, "cycle_proviso", False)
+    algo.hits = algo.misses = 0
+    return algo
+
+
+def _distinct_pre(enabled: list[Transition]) -> list[Transition]:
+    """The first enabled transition of each distinct pre-state"""
+    seeds = {}
+    for t in enabled:
+        seeds.setdefault(t.pre, t)
+    return list(seeds.values())
+
+
+def _log_seed(t: Transition, T: list[Transition]):
+    if log_info_enabled():
+        logger.info("%s <%s> [%d transitions]", _h.comment("seed"), t, len(T))
@@ -7,23 +7,32 @@ from ..types import (
     Union,
     Callable,
 )
+from ..context import Context, with_context
 
 
 def transition_bias(
     set_method: Callable[[MDP, State, Transition], list[Transition]],
     td: Union[str, Transition, TransitionDescription],
 ) -> SetMethod:
-    def choose_transition(mdp: MDP, s: State) -> Transition:
+    method = with_context(set_method)
+
+    def choose_transition(ctx: Context) -> Transition:
         return next(
             filter(
                 lambda t: t.action == td if isinstance(td, str) else t == td,
-                mdp.enabled(s),
+                ctx.enabled,
             ),
             None,
         )
 
-    def algo(mdp: MDP, s: State) -> list[Transition]:
-        return set_method(mdp, s, choose_transition(mdp, s))
+    def algo(
+        mdp: MDP, s: State, t: Transition = None, ctx: Context = None
+    ) -> list[Transition]:
+        if ctx is None:
+            ctx = Context(mdp, s)
+        biased = choose_transition(ctx)
+        return method(mdp, s, biased if biased is not None else t, ctx=ctx)
 
     algo.__name__ = set_method.__name__
+    algo.cycle_proviso = getattr(set_method, "cycle_proviso", False)
     return algo
@@ -0,0 +1,193 @@
+"""Swarm verification [holzmann2008], running many small and diversified
+searches in parallel to quickly find violations in large state spaces
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from queue import Empty, LifoQueue
+
+from .types import (
+    MarkovDecisionProcess as MDP,
+    ActionMap,
+    Callable,
+    SetMethod,
+    State,
+    dataclass,
+)
+from .search import search
+from .set_methods import transition_bias
+from .context import accepts_seed
+from .visited import BitstateHashing
+
+Target = Callable[[State, ActionMap], bool]
+
+# The interval (in seconds) at which the workers are checked while waiting
+# for their results
+_POLL_INTERVAL = 0.1
+
+
+def is_deadlock(_: State, act: ActionMap) -> bool:
+    """Target predicate matching states without any enabled transitions"""
+    return len(act) == 0
+
+
+@dataclass(frozen=True)
+class SwarmResult:
+    """A violation found by one of the searches in the swarm"""
+
+    state: State
+    run: int
+    seed: int
+    bias: str
+    explored: int
+
+
+def swarm(
+    mdp: MDP,
+    target: Target = is_deadlock,
+    set_method: SetMethod = None,
+    runs: int = None,
+    workers: int = None,
+    bits: int = 2**20,
+    seed: int = 0,
+    timeout: float = None,
+) -> SwarmResult:
+    """Runs `runs` independent randomised depth-first searches using bitstate
+    hashing with `bits` of memory each, distributed over `workers` processes.
+
+    Every run uses a different successor order and, for set methods that accept
+    a seed transition (e.g. `stubborn_sets`), a different `transition_bias`.
+    All runs are stopped as soon as one of them finds a state matching `target`,
+    or after `timeout` seconds.
+
+    Returns:
+        SwarmResult: the first violation found, or None if no run found one
+    """
+    if set_method is None:
+        set_method = mdp.set_method
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if runs is None:
+        runs = workers
+
+    configs = list(_configure(mdp, set_method, runs, seed))
+    can_fork = "fork" in multiprocessing.get_all_start_methods()
+
+    if workers <= 1 or not can_fork:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        stop = threading.Event()
+        for config in configs:
+            result = _run(mdp, target, bits, config, stop, deadline)
+            if result is not None or _expired(deadline):
+                return result
+        return None
+
+    return _run_parallel(mdp, target, bits, configs, workers, timeout)
+
+
+def _configure(mdp: MDP, set_method: SetMethod, runs: int, seed: int):
+    """Generate a diversified configuration for each run"""
+    # Only set methods with a seed transition parameter can be biased
+    biases = [None]
+    if callable(set_method) and accepts_seed(set_method):
+        biases += sorted(mdp.actions)
+
+    for run in range(runs):
+        bias = biases[run % len(biases)]
+        method = set_method
+        if bias is not None:
+            method = transition_bias(set_method, bias)
+        yield (run, seed + run, bias, method)
+
+
+def _run(
+    mdp: MDP,
+    target: Target,
+    bits: int,
+    config: tuple,
+    stop: threading.Event,
+    deadline: float = None,
+) -> SwarmResult:
+    run, seed, bias, method = config
+    explored = 0
+    for s, act in search(
+        mdp,
+        set_method=method if method is not None else False,
+        queue=LifoQueue,
+        silent=True,
+        visited=BitstateHashing(bits=bits),
+        seed=seed,
+    ):
+        explored += 1
+        if target(s, act):
+            return SwarmResult(s, run, seed, bias, explored)
+        if explored % 256 == 0 and (stop.is_set() or _expired(deadline)):
+            break
+    return None
+
+
+def _expired(deadline: float) -> bool:
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def _run_parallel(
+    mdp: MDP,
+    target: Target,
+    bits: int,
+    configs: list[tuple],
+    workers: int,
+    timeout: float,
+) -> SwarmResult:
+    ctx = multiprocessing.get_context("fork")
+    stop = ctx.Event()
+    results = ctx.Queue()
+
+    def worker(configs: list[tuple]):
+        for config in configs:
+            if stop.is_set():
+                break
+            try:
+                results.put(_run(mdp, target, bits, config, stop))
+            except Exception as err:  # pylint: disable=broad-except
+                results.put(err)
+
+    processes = [
+        ctx.Process(target=worker, args=(configs[i::workers],), daemon=True)
+        for i in range(min(workers, len(configs)))
+    ]
+    for p in processes:
+        p.start()
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    result, pending = None, len(configs)
+    try:
+        while pending > 0 and result is None:
+            wait = _POLL_INTERVAL
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                wait = min(wait, remaining)
+            # A worker killed (e.g. out of memory) never posts its results,
+            # stop waiting once none is left. Results posted by a worker are
+            # flushed before it exits, so they are in the queue if it is dead.
+            alive = any(p.is_alive() for p in processes)
+            try:
+                result = results.get(timeout=wait)
+            except Empty:
+                if not alive:
+                    break
+                continue
+            pending -= 1
+            if isinstance(result, Exception):
+                raise result
+    finally:
+        stop.set()
+        for p in processes:
+            p.join(timeout=1.0)
+            if p.is_alive():
+                p.terminate()
+
+    return result
@@ -0,0 +1,363 @@
+"""Symmetry reduction, exploring the quotient of the state space under a
+group of permutations of local states, variables and actions
+"""
+
+from math import factorial
+
+from .types import (
+    MarkovDecisionProcess as MDP,
+    Iterable,
+    State,
+    Transition,
+    dataclass,
+    imdict,
+)
+from .model import State as _State, Op
+
+
+@dataclass(frozen=True)
+class Permutation:
+    """A bijection on the names (local states, variables and actions) of an MDP,
+    names that are not in the mapping are left unchanged
+    """
+
+    mapping: imdict[str, str]
+
+    def __call__(self, name: str) -> str:
+        return self.mapping.get(name, name)
+
+    def state(self, s: State) -> State:
+        """Applies the permutation to a global state"""
+        return _State(
+            frozenset(map(self, s.s)),
+            imdict({self(k): v for k, v in s.ctx.items()}),
+        )
+
+    def __mul__(self, other: "Permutation") -> "Permutation":
+        """The composition (self ∘ other)"""
+        names = set(self.mapping).union(other.mapping)
+        return Permutation(
+            imdict(
+                {
+                    name: self(other(name))
+                    for name in names
+                    if self(other(name)) != name
+                }
+            )
+        )
+
+
+class Symmetry:
+    """A group of permutations generated by `generators`, each of which must be
+    an automorphism of the MDP (i.e. it maps the set of transitions onto itself).
+
+    `canonical(s)` returns a unique representative of the orbit of `s`. Labels
+    of states used in properties must be invariant under the permutations.
+    """
+
+    def __init__(
+        self,
+        mdp: MDP,
+        generators: Iterable[Permutation],
+        max_size: int = 10_000,
+    ):
+        generators = [_ensure_permutation(g) for g in generators]
+        for g in generators:
+            if not is_automorphism(mdp, g):
+                raise ValueError(
+                    f"{g.mapping} is not an automorphism of [{mdp.name}]"
+                )
+        self.generators = generators
+        self.elements = _closure(generators, max_size)
+
+    def canonical(self, s: State) -> State:
+        """Returns the representative of the orbit of `s`"""
+        return min((g.state(s) for g in self.elements), key=_state_key)
+
+    def reduce(self, dist: dict[State, float]) -> dict[State, float]:
+        """Maps a distribution onto the representatives, adding up the
+        probabilities of successors within the same orbit
+        """
+        ret = {}
+        for s_, p in dist.items():
+            s_ = self.canonical(s_)
+            ret[s_] = ret.get(s_, 0) + p
+        return ret
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+
+class _ProcessSymmetry(Symmetry):
+    """The full symmetric group over a set of identical processes that do not
+    share variables with each other, canonicalised by sorting their local states
+    """
+
+    def __init__(self, mdp: MDP, processes: list, to_ref: list[dict]):
+        self.generators = []
+        self.elements = []
+        self._processes = processes
+        self._to_ref = to_ref
+        self._from_ref = [{v: k for k, v in m.items()} for m in to_ref]
+        self._variables = sorted(_moved_variables(mdp, to_ref)[0])
+        self._size = factorial(len(processes))
+
+    def canonical(self, s: State) -> State:
+        local = []
+        for p, to_ref, from_ref in zip(
+            self._processes, self._to_ref, self._from_ref
+        ):
+            values = tuple(
+                (1, s.ctx[from_ref[v]]) if from_ref[v] in s.ctx else (0, 0)
+                for v in self._variables
+            )
+            local.append((to_ref.get(s(p), ""), values))
+        local.sort()
+
+        states = set(s.s).difference(s(p) for p in self._processes)
+        ctx = dict(s.ctx)
+        for (ss, values), from_ref in zip(local, self._from_ref):
+            if ss:
+                states.add(from_ref[ss])
+            for v, (is_set, value) in zip(self._variables, values):
+                if is_set:
+                    ctx[from_ref[v]] = value
+        return _State(frozenset(states), imdict(ctx))
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def symmetry(mdp: MDP, *groups: Iterable, max_size: int = 10_000) -> Symmetry:
+    """Creates the symmetry of interchangeable processes, either the process
+    groups given (lists of processes, or of their names) or the groups of
+    `rename`-generated copies detected in `mdp`
+    """
+    if not groups:
+        groups = detect_process_groups(mdp)
+    generators = []
+    for group in groups:
+        group = [_ensure_process(mdp, p) for p in group]
+        if len(group) < 2:
+            continue
+        to_ref = [_align(mdp, p, group[0]) for p in group]
+        if None in to_ref:
+            raise ValueError(f"Processes {group} are not identical")
+        if len(groups) == 1 and _fully_symmetric(mdp, group, to_ref):
+            return _ProcessSymmetry(mdp, group, to_ref)
+        generators += _group_generators(mdp, group)
+    return Symmetry(mdp, generators, max_size)
+
+
+def detect_process_groups(mdp: MDP) -> list[list]:
+    """Groups the processes of an MDP that are identical up to renaming"""
+    groups = []
+    for p in mdp.processes:
+        for group in groups:
+            if _align(mdp, p, group[0]) is not None:
+                group.append(p)
+                break
+        else:
+            groups.append([p])
+    return [group for group in groups if len(group) > 1]
+
+
+def is_automorphism(mdp: MDP, g: Permutation) -> bool:
+    """Whether the permutation maps the transitions of `mdp` onto themselves"""
+    transitions = set(map(_transition_key, mdp.transitions))
+    return all(_transition_key(tr, g) in transitions for tr in mdp.transitions)
+
+
+def _group_generators(mdp: MDP, group: list) -> list[Permutation]:
+    """Adjacent transpositions generate the symmetric group, if they are not
+    automorphisms, try the rotation of the processes instead
+    """
+    swaps = [
+        _permutation(mdp, [(group[i], group[i + 1]), (group[i + 1], group[i])])
+        for i in range(len(group) - 1)
+    ]
+    if all(g is not None and is_automorphism(mdp, g) for g in swaps):
+        return swaps
+    n = len(group)
+    rotation = _permutation(
+        mdp, [(group[i], group[(i + 1) % n]) for i in range(n)]
+    )
+    if rotation is not None and is_automorphism(mdp, rotation):
+        return [rotation]
+    raise ValueError(f"Processes {group} are not symmetric")
+
+
+def _fully_symmetric(mdp: MDP, group: list, to_ref: list[dict]) -> bool:
+    """Whether sorting the local states of the group gives a canonical form"""
+    variables = _moved_variables(mdp, to_ref)
+    disjoint = sum(map(len, variables)) == len(set().union(*variables))
+    generators = [
+        _permutation(mdp, [(group[i], group[i + 1]), (group[i + 1], group[i])])
+        for i in range(len(group) - 1)
+    ]
+    return disjoint and all(
+        g is not None and is_automorphism(mdp, g) for g in generators
+    )
+
+
+def _moved_variables(mdp: MDP, to_ref: list[dict]) -> list[set[str]]:
+    """The variables of each process, except those shared by all processes"""
+    variables = _variables(mdp)
+    shared = set.intersection(*(set(m.items()) for m in to_ref))
+    return [
+        set(v for v, w in m.items() if v in variables and (v, w) not in shared)
+        for m in to_ref
+    ]
+
+
+def _permutation(mdp: MDP, pairs: list[tuple]) -> Permutation:
+    """Combine the name mappings of process pairs (from, to) into a permutation"""
+    mapping = {}
+    for p, q in pairs:
+        for k, v in _align(mdp, p, q).items():
+            if mapping.get(k, v) != v:
+                return None
+            mapping[k] = v
+    if len(set(mapping.values())) != len(mapping):
+        return None
+    return Permutation(imdict({k: v for k, v in mapping.items() if k != v}))
+
+
+def _align(mdp: MDP, p, q) -> dict[str, str]:
+    """Map the names used by process `p` onto the names used by `q` by aligning
+    their transitions in order, returns None if the processes differ
+    """
+    trs_p, trs_q = _local_transitions(mdp, p), _local_transitions(mdp, q)
+    if len(trs_p) != len(trs_q):
+        return None
+    mapping = {}
+
+    for t1, t2 in zip(trs_p, trs_q):
+        post1, post2 = list(t1.post.items()), list(t2.post.items())
+        if (
+            len(post1) != len(post2)
+            or mapping.setdefault(t1.action, t2.action) != t2.action
+            or not _match(
+                _local_names(t1.pre, p), _local_names(t2.pre, q), mapping
+            )
+        ):
+            return None
+        ops1, ops2 = _ops(t1.guard.used()), _ops(t2.guard.used())
+        for ((s1, upd1), p1), ((s2, upd2), p2) in zip(post1, post2):
+            if p1 != p2 or not _match(
+                _local_names(s1, p), _local_names(s2, q), mapping
+            ):
+                return None
+            ops1 += _ops(upd1.used())
+            ops2 += _ops(upd2.used())
+        if not _match_ops(ops1, ops2, mapping):
+            return None
+    if len(set(mapping.values())) != len(mapping):
+        return None
+    return mapping
+
+
+def _match(names1: list[str], names2: list[str], mapping: dict) -> bool:
+    """Pair up two lists of names, preferring pairs that are already mapped"""
+    if len(names1) != len(names2):
+        return False
+    rest = list(names2)
+    unmapped = []
+    for a in names1:
+        if a in mapping:
+            if mapping[a] not in rest:
+                return False
+            rest.remove(mapping[a])
+        else:
+            unmapped.append(a)
+    mapping.update(zip(unmapped, rest))
+    return True
+
+
+def _match_ops(ops1: list, ops2: list, mapping: dict) -> bool:
+    """Pair up the variables of operations that only differ in the variable"""
+    if len(ops1) != len(ops2):
+        return False
+    for group1, group2 in zip(ops1, ops2):
+        if set(group1) != set(group2):
+            return False
+        if not all(_match(group1[k], group2[k], mapping) for k in group1):
+            return False
+    return True
+
+
+def _local_transitions(mdp: MDP, p) -> list[Transition]:
+    transitions = getattr(p, "transitions", None)
+    if transitions is None or p is mdp:
+        transitions = [tr for tr in mdp.transitions if p in tr.active]
+    return list(transitions)
+
+
+def _local_names(s: State, p) -> list[str]:
+    return sorted(ss for ss in s.s if ss in p)
+
+
+def _ops(ops: Iterable[Op]) -> list[dict[tuple[str, str], list[str]]]:
+    """Group the variables of operations by operator and constant"""
+    groups = {}
+    for op in ops:
+        groups.setdefault((op.op, op.right), []).append(op.left)
+    return [{k: sorted(v) for k, v in groups.items()}]
+
+
+def _variables(mdp: MDP) -> set[str]:
+    return set(op.left for tr in mdp.transitions for op in tr.used()).union(
+        mdp.init.ctx
+    )
+
+
+def _transition_key(tr: Transition, g: Permutation = None) -> tuple:
+    if g is None:
+        g = Permutation(imdict())
+    guard = frozenset(
+        frozenset((g(op.left), op.op, op.right) for op in disj)
+        for disj in tr.guard.expr
+    )
+    post = frozenset(
+        (
+            frozenset(map(g, s_.s)),
+            frozenset((g(op.left), op.op, op.right) for op in upd.expr),
+            p,
+        )
+        for (s_, upd), p in tr.post.items()
+    )
+    return (g(tr.action), frozenset(map(g, tr.pre.s)), guard, post)
+
+
+def _closure(generators: list[Permutation], max_size: int):
+    identity = Permutation(imdict())
+    elements = {identity}
+    frontier = [identity]
+    while frontier:
+        g = frontier.pop()
+        for h in generators:
+            gh = h * g
+            if gh not in elements:
+                if len(elements) >= max_size:
+                    raise ValueError(
+                        f"Symmetry group exceeds {max_size} elements"
+                    )
+                elements.add(gh)
+                frontier.append(gh)
+    return list(elements)
+
+
+def _ensure_permutation(g) -> Permutation:
+    if isinstance(g, Permutation):
+        return g
+    return Permutation(imdict(g))
+
+
+def _ensure_process(mdp: MDP, p):
+    if isinstance(p, str):
+        return next(q for q in mdp.processes if q.name == p)
+    return p
+
+
+def _state_key(s: State) -> tuple:
+    return (tuple(sorted(s.s)), tuple(sorted(s.ctx.items())))
@@ -31,6 +31,9 @@ class imdict(dict):
     def _immutable(self, *a, **kw):
         raise TypeError("object is immutable")
 
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
     __setitem__ = _immutable
     __delitem__ = _immutable
 
@@ -1,4 +1,5 @@
 import re
+import sys
 import itertools
 import operator
 import logging
@@ -8,6 +9,11 @@ from typing import Generator
 import numpy as np
 from collections import Counter
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 from ..types import (
     RenameFunction,
     Callable,
@@ -35,6 +41,42 @@ def log_info_enabled() -> bool:
     return logger.isEnabledFor(logging.INFO)
 
 
+def memory_usage() -> int:
+    """Returns the resident set size of the current process in bytes"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        from os import sysconf
+
+        with open("/proc/self/statm", encoding="utf-8") as f:
+            return int(f.read().split()[1]) * sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, ImportError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # Fall back to the peak resident set size (in kilobytes, bytes on macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def available_memory() -> int:
+    """Returns the memory available to new allocations in bytes, or 0 if it
+    cannot be determined
+    """
+    if psutil is not None:
+        return psutil.virtual_memory().available
+    try:
+        with open("/proc/meminfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
 def get_terminal_width():
     try:
         width, _ = get_terminal_size()
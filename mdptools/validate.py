@@ -72,8 +72,8 @@ def _validate_enabled_nonempty(
     """Validate: 'forall s in S : en(s) != {}'"""
     errors = [
         f"{_h.function('en')}({format_str(s, _h.state)}) -> {_h.error('{}')}"
-        for s, _ in mdp.search()
-        if len(mdp.enabled(s)) == 0
+        for s, act in mdp.search()
+        if len(act) == 0
     ]
     return (len(errors) == 0, errors)
 
@@ -0,0 +1,273 @@
+"""Visited-set backends used by `search` to remember explored states"""
+
+import dbm
+import math
+import os
+import shutil
+import tempfile
+from hashlib import blake2b
+
+from .types import State, Iterator
+from .utils import np
+
+
+def pack_state(s: State) -> bytes:
+    """Packs a global state into a canonical byte string"""
+    local = "\x1f".join(sorted(s.s))
+    ctx = "\x1f".join(f"{k}={v}" for k, v in sorted(s.ctx.items()))
+    return f"{local}\x1e{ctx}".encode("utf-8")
+
+
+def state_hash(s: State, digest_size: int = 8) -> int:
+    """Returns a stable hash of a global state (independent of `PYTHONHASHSEED`)"""
+    digest = blake2b(pack_state(s), digest_size=digest_size).digest()
+    return int.from_bytes(digest, "little")
+
+
+class VisitedSet:
+    """Stores every visited state in full, the default for `search`"""
+
+    approximate: bool = False
+
+    def __init__(self):
+        self._states = set()
+
+    def add(self, s: State) -> bool:
+        """Marks `s` as visited, returns False if it had already been visited"""
+        if s in self._states:
+            return False
+        self._states.add(s)
+        return True
+
+    def report(self) -> dict[str, float]:
+        """Summarises the visited set after a search"""
+        return {"states": len(self)}
+
+    def close(self):
+        """Releases the resources held by the set, `search` closes the sets it
+        creates from a class, others are closed by their owner
+        """
+
+    def __contains__(self, s: State) -> bool:
+        return s in self._states
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+
+class BitstateHashing(VisitedSet):
+    """Bitstate (supertrace) hashing [holzmann1998], each visited state is only
+    recorded as `k` bits in a bit array of size `bits`.
+
+    States whose bits are all set already are (possibly wrongly) considered
+    visited, meaning part of the state space may be omitted.
+    """
+
+    approximate: bool = True
+
+    def __init__(self, bits: int = 2**27, k: int = 3):
+        # Only bits are stored, not the states of a `VisitedSet`
+        self.bits = bits
+        self.k = k
+        self._array = bytearray((bits + 7) // 8)
+        self._count = 0
+        self._bits_set = 0
+        self._expected_omissions = 0.0
+
+    def add(self, s: State) -> bool:
+        # Keep track of the probability that this state would have been omitted
+        p_omit = self.collision_probability
+        is_new = False
+        for idx in self._indices(s):
+            byte, mask = idx >> 3, 1 << (idx & 7)
+            if not self._array[byte] & mask:
+                self._array[byte] |= mask
+                self._bits_set += 1
+                is_new = True
+        if is_new:
+            self._count += 1
+            self._expected_omissions += p_omit
+        return is_new
+
+    @property
+    def fill_ratio(self) -> float:
+        """The fraction of bits that are set"""
+        return self._bits_set / self.bits
+
+    @property
+    def collision_probability(self) -> float:
+        """The probability that an unvisited state is reported as visited"""
+        return self.fill_ratio**self.k
+
+    @property
+    def coverage(self) -> float:
+        """Estimated fraction of the reachable state space that was explored"""
+        return self._count / (self._count + self._expected_omissions or 1)
+
+    def report(self) -> dict[str, float]:
+        return {
+            "states": self._count,
+            "bits": self.bits,
+            "k": self.k,
+            "fill_ratio": self.fill_ratio,
+            "collision_probability": self.collision_probability,
+            "coverage": self.coverage,
+        }
+
+    def __contains__(self, s: State) -> bool:
+        return all(
+            self._array[idx >> 3] & (1 << (idx & 7))
+            for idx in self._indices(s)
+        )
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _indices(self, s: State) -> Iterator[int]:
+        # Derive k indices from a single 128-bit hash (double hashing)
+        h = state_hash(s, digest_size=16)
+        h1, h2 = h & 0xFFFFFFFFFFFFFFFF, (h >> 64) | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.k))
+
+
+class HashCompaction(VisitedSet):
+    """Hash compaction [wolper1993], each visited state is only stored as a 64-bit
+    fingerprint in an open addressing hash table backed by a NumPy array.
+
+    The table holds up to `max_load` fingerprints per slot before doubling, so
+    a state takes 8 / `max_load` (about 9) bytes when the table is full, and
+    up to twice as much right after it grows. Giving the expected number of
+    states as `capacity` avoids growing.
+
+    Two states with the same fingerprint are indistinguishable, so a state may
+    (with a very small probability) be omitted from the search.
+    """
+
+    approximate: bool = True
+    max_load: float = 0.9
+
+    def __init__(self, capacity: int = 2**16):
+        # Only fingerprints are stored, not the states of a `VisitedSet`
+        size = _next_power_of_two(math.ceil(capacity / self.max_load))
+        self._table = np.zeros(size, dtype=np.uint64)
+        self._count = 0
+
+    def add(self, s: State) -> bool:
+        # Zero marks an empty slot in the table
+        h = state_hash(s) or 1
+        if not self._insert(self._table, h):
+            return False
+        self._count += 1
+        if self._count > self.max_load * len(self._table):
+            self._grow()
+        return True
+
+    @property
+    def omission_probability(self) -> float:
+        """The probability that at least one state was omitted due to a
+        fingerprint collision, 1 - e^(-n^2 / 2^65)
+        """
+        return -np.expm1(-(float(self._count) ** 2) / 2.0**65)
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes used by the fingerprint table"""
+        return self._table.nbytes
+
+    def report(self) -> dict[str, float]:
+        return {
+            "states": self._count,
+            "bytes": self.nbytes,
+            "omission_probability": self.omission_probability,
+        }
+
+    def __contains__(self, s: State) -> bool:
+        h = state_hash(s) or 1
+        mask = len(self._table) - 1
+        i = h & mask
+        while self._table[i] != 0:
+            if self._table[i] == h:
+                return True
+            i = (i + 1) & mask
+        return False
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _grow(self):
+        table = np.zeros(2 * len(self._table), dtype=np.uint64)
+        for h in self._table[self._table != 0].tolist():
+            self._insert(table, h)
+        self._table = table
+
+    @staticmethod
+    def _insert(table: np.ndarray, h: int) -> bool:
+        # Linear probing
+        mask = len(table) - 1
+        i = h & mask
+        while True:
+            value = table[i]
+            if value == 0:
+                table[i] = h
+                return True
+            if value == h:
+                return False
+            i = (i + 1) & mask
+
+
+class DiskVisitedSet(VisitedSet):
+    """Stores every visited state in full in a `dbm` database at `path` (a
+    temporary file by default), for state spaces that do not fit in memory.
+
+    Pickling (e.g. in a checkpoint) only keeps the path, the database is
+    reopened when the set is loaded. Closing the set removes the temporary
+    directory, a given `path` is left to the caller.
+    """
+
+    def __init__(self, path: str = None):
+        self._directory = None
+        if path is None:
+            self._directory = tempfile.mkdtemp(prefix="mdptools-")
+            path = os.path.join(self._directory, "visited")
+        self.path = path
+        self._db = dbm.open(path, "n")
+        self._count = 0
+
+    def add(self, s: State) -> bool:
+        key = pack_state(s)
+        if key in self._db:
+            return False
+        self._db[key] = b""
+        self._count += 1
+        return True
+
+    def close(self):
+        self._db.close()
+        if self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+
+    def report(self) -> dict[str, float]:
+        return {"states": self._count, "path": self.path}
+
+    def __contains__(self, s: State) -> bool:
+        return pack_state(s) in self._db
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getstate__(self) -> dict:
+        if hasattr(self._db, "sync"):
+            self._db.sync()
+        return {
+            "path": self.path,
+            "_count": self._count,
+            "_directory": self._directory,
+        }
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._db = dbm.open(self.path, "c")
+
+
+def _next_power_of_two(n: int) -> int:
+    return 1 << max(0, n - 1).bit_length()
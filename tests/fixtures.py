@@ -138,3 +138,20 @@ def godefroid_4_11():
         processes={"A": ("a0", "a1", "a2", "a4"), "B": ("b0", "b1")},
         init=("a0", "b0", "x:=0, y:=0"),
     )
+
+
+@pytest.fixture
+def dining_philosophers():
+    return MDP(
+        [
+            ("take-l_1", ("a0", "f1=0"), ("a1", "f1:=1")),
+            ("take-r_1", ("a1", "f2=0"), ("a2", "f2:=1")),
+            ("release_1", "a2", ("a0", "f1:=0, f2:=0")),
+            ("take-l_2", ("b0", "f2=0"), ("b1", "f2:=1")),
+            ("take-r_2", ("b1", "f1=0"), ("b2", "f1:=1")),
+            ("release_2", "b2", ("b0", "f1:=0, f2:=0")),
+        ],
+        processes={"A": ("a0", "a1", "a2"), "B": ("b0", "b1", "b2")},
+        init=("a0", "b0", "f1:=0, f2:=0"),
+        name="DiningPhilosophers",
+    )
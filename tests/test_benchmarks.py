@@ -0,0 +1,45 @@
+"""Unit-tests for the `benchmarks` package"""
+
+import json
+
+from mdptools import MarkovDecisionProcess as MDP, validate
+from benchmarks import FAMILIES, run, run_family
+from benchmarks import micro
+
+
+def test_model_families():
+    """The families scale with n and only the philosophers deadlock"""
+    for family, make in FAMILIES.items():
+        sizes = [MDP(*make(n)).explore().states for n in (2, 3)]
+        assert sizes[0] < sizes[1]
+        assert validate(MDP(*make(2)))[0] == (family != "philosophers")
+
+
+def test_run_family():
+    """Each operation gets one timing per size"""
+    curves = run_family("bounded_queue", [1, 2], repeat=1)
+    assert curves["sizes"] == [1, 2]
+    assert curves["states"] == [4, 12]
+    assert len(curves["timings"]["search"]) == 2
+    assert all(
+        len(timings) == 2 and all(t >= 0 for t in timings)
+        for timings in curves["timings"].values()
+    )
+    results = run(["leader_election"], [2], repeat=1)
+    assert json.loads(json.dumps(results))["families"]["leader_election"]
+
+
+def test_microbenchmarks():
+    """Primitives slower than the baseline beyond the threshold are flagged"""
+    results = micro.run(number=10, repeat=1)
+    assert set(results["results"]) == set(micro.microbenchmarks())
+    assert all(ns > 0 for ns in results["results"].values())
+
+    baseline = {"results": {"a": 100.0, "b": 100.0, "c": 100.0}}
+    current = {"results": {"a": 105.0, "b": 120.0, "d": 1.0}}
+    rows = micro.compare(current, baseline, threshold=0.1)
+    assert [(name, regressed) for name, *_, regressed in rows] == [
+        ("a", False),
+        ("b", True),
+    ]
+    assert "REGRESSION" in micro.format_comparison(rows).splitlines()[2]
@@ -0,0 +1,89 @@
+"""Unit-tests for the `bisimulation` module"""
+
+from mdptools import MarkovDecisionProcess as MDP
+from mdptools.bisimulation import partition, quotient
+from mdptools.utils import float_is
+
+
+def test_partition_merges_equivalent_states():
+    m = MDP(
+        [
+            ("a", "s0", {"s1": 0.5, "s2": 0.5}),
+            ("b", "s1", "s3"),
+            ("b", "s2", "s4"),
+            ("c", "s3"),
+            ("c", "s4"),
+        ]
+    )
+    states, blocks = partition(m)
+    block = dict(zip((next(iter(s)) for s in states), blocks.tolist()))
+    assert block["s1"] == block["s2"]
+    assert block["s3"] == block["s4"]
+    assert len(set(blocks.tolist())) == 3
+
+    q = quotient(m)
+    assert len(q.transitions) == 3
+    (dist,) = [tr.post for tr in q.transitions if tr.action == "a"]
+    assert len(dist) == 1
+    assert float_is(sum(dist.values()), 1.0)
+
+
+def test_partition_with_labels():
+    m = MDP([("a", "s0", {"s1": 0.5, "s2": 0.5}), ("b", "s1"), ("b", "s2")])
+    _, blocks = partition(m)
+    assert len(set(blocks.tolist())) == 2
+    _, blocks = partition(m, labels=lambda s: "s2" in s)
+    assert len(set(blocks.tolist())) == 3
+
+
+def test_quotient_of_system(baier_p1: MDP, baier_p2: MDP, baier_rm: MDP):
+    m = MDP(baier_p1, baier_p2, baier_rm)
+    full = m.explore()
+    q = quotient(m, labels=lambda s: ("crit_1" in s, "crit_2" in s))
+    reduced = q.explore()
+    assert reduced.complete
+    assert reduced.states <= full.states
+    assert q.to_prism().startswith("mdp")
+
+
+def test_minimize_method():
+    m = MDP([("a", "s0", {"s1": 0.5, "s2": 0.5}), ("b", "s1"), ("b", "s2")])
+    q = m.minimize()
+    assert q.explore().states == 2
+    assert q.is_valid
+
+
+def _traces(m: MDP, depth: int) -> set[tuple]:
+    """The sequences of actions of up to `depth` steps from the initial state"""
+    traces, frontier = set(), {((), m.init)}
+    for _ in range(depth):
+        frontier = {
+            (trace + (tr.action,), s_)
+            for trace, s in frontier
+            for tr in m.enabled(s)
+            for s_ in tr.successors(s)
+        }
+        traces |= {trace for trace, _ in frontier}
+    return traces
+
+
+def test_quotient_keeps_transitions_with_same_action():
+    m = MDP(
+        [
+            ("a", "s0", "s1"),
+            ("a", "s0", "s2"),
+            ("b", "s1", "s0"),
+            ("c", "s2", "s0"),
+            ("x", "s0", "s3"),
+            ("b", "s3", "s0"),
+        ]
+    )
+    states, blocks = partition(m)
+    block = dict(zip((next(iter(s)) for s in states), blocks.tolist()))
+    assert block["s1"] == block["s3"]
+    assert block["s1"] != block["s2"]
+
+    q = quotient(m)
+    assert q.explore().states == 3
+    assert _traces(q, 4) == _traces(m, 4)
+    assert ("a", "b") in _traces(q, 2)
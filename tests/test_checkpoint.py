@@ -0,0 +1,73 @@
+"""Unit-tests for the `checkpoint` module"""
+
+import pytest
+from mdptools import MarkovDecisionProcess as MDP
+from mdptools.checkpoint import load_checkpoint, model_fingerprint
+from mdptools.search import Budget
+
+
+def test_model_fingerprint(godefroid_4_11: MDP, dining_philosophers: MDP):
+    m = godefroid_4_11
+    reordered = MDP(
+        list(reversed(m.transitions)),
+        processes={"A": ("a0", "a1", "a2", "a4"), "B": ("b0", "b1")},
+        init=("a0", "b0", "x:=0, y:=0"),
+    )
+    assert model_fingerprint(m) == model_fingerprint(reordered)
+    assert model_fingerprint(m) != model_fingerprint(dining_philosophers)
+
+
+def test_resume_after_budget(tmp_path, baier_p1: MDP, baier_p2: MDP, baier_rm):
+    m = MDP(baier_p1, baier_p2, baier_rm)
+    file_path = str(tmp_path / "search.ckpt")
+    expected = m.explore()
+
+    partial = m.explore(budget=Budget(max_states=5), checkpoint=file_path)
+    assert partial.limit == "max_states"
+    assert load_checkpoint(file_path, m).states == 5
+
+    resumed = m.explore(checkpoint=file_path, resume=True)
+    assert resumed.complete
+    assert resumed.states == expected.states
+    assert resumed.transition_map == expected.transition_map
+
+
+def test_resume_after_interrupt(tmp_path, godefroid_4_11: MDP):
+    m = godefroid_4_11
+    file_path = str(tmp_path / "search.ckpt")
+    generator = m.search(checkpoint=file_path, checkpoint_interval=0)
+    seen = [next(generator)[0] for _ in range(3)]
+    generator.close()
+
+    seen += [s for s, _ in m.search(checkpoint=file_path, resume=True)]
+    expected = set(s for s, _ in m.search())
+    assert len(seen) == len(expected)
+    assert set(seen) == expected
+
+
+def test_resume_changed_model(tmp_path, godefroid_4_11, dining_philosophers):
+    file_path = str(tmp_path / "search.ckpt")
+    godefroid_4_11.explore(checkpoint=file_path)
+    with pytest.raises(ValueError):
+        dining_philosophers.explore(checkpoint=file_path, resume=True)
+
+
+def test_resume_with_sleep_sets(tmp_path, dining_philosophers: MDP):
+    m = dining_philosophers
+    file_path = str(tmp_path / "search.ckpt")
+    expected = set(s for s, _ in m.search(sleep_sets=True))
+
+    generator = m.search(
+        sleep_sets=True, checkpoint=file_path, checkpoint_interval=0
+    )
+    seen = [next(generator)[0] for _ in range(3)]
+    generator.close()
+    assert load_checkpoint(file_path, m).sleep
+
+    seen += [
+        s
+        for s, _ in m.search(
+            sleep_sets=True, checkpoint=file_path, resume=True
+        )
+    ]
+    assert set(seen) == expected
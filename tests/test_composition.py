@@ -1,12 +1,33 @@
 """Parallel composition tests"""
-from mdptools import MarkovDecisionProcess as MDP
+
+import gc
+import weakref
+from queue import LifoQueue, SimpleQueue
+from benchmarks.models import bounded_queue, leader_election
+from mdptools import MarkovDecisionProcess as MDP, compose
 from mdptools.types import State
+from mdptools.context import (
+    Context,
+    with_context,
+    dependency_tables,
+    variable_ownership,
+)
 from mdptools.utils import logger, logging
+from mdptools.set_methods.algorithm2_overmans_algorithm import (
+    interaction_graph,
+)
 from mdptools.set_methods import (
     conflicting_transitions,
     overmans_algorithm,
     stubborn_sets,
     transition_bias,
+    ample_sets,
+    visible_transitions,
+    smallest_set,
+    memoize,
+    confluence,
+    confluence_reduction,
+    confluent_transitions,
 )
 
 
@@ -116,6 +137,15 @@ def test_overmans_algorithm_with_bias(godefroid_4_11: MDP):
     logger.setLevel(logging.NOTSET)
 
 
+def test_overmans_interaction_graph(godefroid_4_11: MDP):
+    """The processes linked to each local state are computed once per MDP"""
+    m = godefroid_4_11
+    graph = interaction_graph(m)
+    assert graph is interaction_graph(m)
+    linked = {ss: {p.name for p in ps} for ss, ps in graph.items()}
+    assert linked == {"a0": {"A"}, "a1": {"A", "B"}, "b0": {"A", "B"}}
+
+
 def test_stubborn_sets(godefroid_4_11: MDP):
     """Stubborn sets algorithm"""
     logger.setLevel(logging.INFO)
@@ -132,3 +162,339 @@ def test_stubborn_sets_with_baier(baier_p1: MDP, baier_p2: MDP, baier_rm: MDP):
     state_space = list(m.search(set_method=stubborn_sets))
     assert len(state_space) == 10
     logger.setLevel(logging.NOTSET)
+
+
+def test_compose_with_minimize():
+    """Compositional minimisation of processes before composition"""
+    m1 = MDP(
+        [
+            ("a", "s0", {"s1": 0.5, "s2": 0.5}),
+            ("b", "s1", "s3"),
+            ("b", "s2", "s4"),
+            ("c", "s3", "s0"),
+            ("c", "s4", "s0"),
+        ],
+        name="M1",
+    )
+    m2 = m1.rename(("s", "t"), {"a": "x", "b": "y"}, "M2")
+
+    full = compose(m1, m2)
+    reduced = compose(m1, m2, minimize=True)
+
+    assert full.explore().states == 5 * 5
+    assert reduced.explore().states == 3 * 3
+    assert {p.name for p in reduced.processes} == {"M1", "M2"}
+    # The shared action c is kept visible
+    assert reduced.is_valid
+
+    def labels(s):
+        return "s0" in s, "t0" in s
+
+    assert _behaviour(reduced, labels) == _behaviour(full, labels)
+
+
+def _behaviour(m: MDP, labels) -> tuple[set, set]:
+    """The labels of the reachable states and of the reachable deadlocks"""
+    states = list(m.search(set_method=False, silent=True))
+    return (
+        {labels(s.s) for s, _ in states},
+        {labels(s.s) for s, act in states if not act},
+    )
+
+
+def test_compose_with_minimize_same_action():
+    """Minimisation keeps the choices between transitions with one action"""
+    p = MDP(
+        [
+            ("a", "p0", "p1"),
+            ("a", "p0", "p2"),
+            ("b", "p1", "p0"),
+            ("c", "p2", "p0"),
+            ("x", "p0", "p3"),
+            ("b", "p3", "p0"),
+        ],
+        name="P",
+    )
+    # Q observes whether b can follow a directly
+    q = MDP(
+        [("a", "q0", "q1"), ("b", "q1", "q2"), ("c", "q1", "q3")], name="Q"
+    )
+
+    def labels(s):
+        return "q2" in s, "q3" in s
+
+    full = compose(p, q)
+    reduced = compose(p, q, minimize=True, labels=labels)
+
+    (p_,) = [p_ for p_ in reduced.processes if p_.name == "P"]
+    assert len(p_.states) == 3
+    assert _behaviour(reduced, labels) == _behaviour(full, labels)
+    assert (True, False) in _behaviour(reduced, labels)[0]
+
+
+def test_ample_sets(godefroid_4_11: MDP):
+    """Ample sets algorithm"""
+    logger.setLevel(logging.INFO)
+    m = godefroid_4_11
+    state_space = list(m.search(set_method=ample_sets))
+    assert len(state_space) == 6
+    logger.setLevel(logging.NOTSET)
+
+
+def test_ample_sets_cycle_proviso():
+    """Ample sets must not ignore processes forever on cycles"""
+    p = MDP([("a", "p0", "p1"), ("b", "p1", "p0")], name="P")
+    q = MDP([("c", "q0", {"q1": 0.5, "q0": 0.5}), ("d", "q1", "q0")], name="Q")
+    m = MDP(p, q)
+
+    for queue in (LifoQueue, SimpleQueue):
+        state_space = [
+            s for s, _ in m.search(set_method=ample_sets, queue=queue)
+        ]
+        assert any("q1" in s for s in state_space)
+        assert len(state_space) <= 4
+
+    set_method = visible_transitions(["a", "b"])
+    state_space = [s for s, _ in m.search(set_method=set_method)]
+    assert len(state_space) == 4
+
+
+def test_stubborn_sets_do_not_accord():
+    """Writes of the same value, and writes that keep a guard true, accord"""
+    m = MDP(
+        [
+            ("t1", "a0", ("a1", "x:=1")),
+            ("t2", ("a1", "x>0"), "a2"),
+            ("t3", "b0", ("b1", "x:=1")),
+            ("t4", ("b1", "x=1"), "b2"),
+        ],
+        processes={"A": ("a0", "a1", "a2"), "B": ("b0", "b1", "b2")},
+        init=("a0", "b0", "x:=0"),
+    )
+    t1, t2, t3, t4 = m.transitions
+    assert t1.can_be_dependent(t3) and not t1.do_not_accord(t3)
+    assert t1.can_be_dependent(t4) and not t1.do_not_accord(t4)
+    assert not t3.do_not_accord(t2)
+
+    full = list(m.search())
+    reduced = list(m.search(set_method=stubborn_sets))
+    assert len(full) == 9
+    assert len(reduced) == 5
+
+
+def test_sleep_sets(
+    godefroid_4_11: MDP, baier_p1: MDP, baier_p2: MDP, baier_rm: MDP
+):
+    """Sleep sets explore fewer transitions but reach the same states"""
+    for m in (godefroid_4_11, MDP(baier_p1, baier_p2, baier_rm)):
+        for set_method in (None, stubborn_sets):
+            for queue in (LifoQueue, SimpleQueue):
+                full = m.explore(set_method=set_method, queue=queue)
+                reduced = m.explore(
+                    set_method=set_method, queue=queue, sleep_sets=True
+                )
+                assert set(reduced.transition_map) == set(full.transition_map)
+                assert sum(map(len, reduced.transition_map.values())) <= sum(
+                    map(len, full.transition_map.values())
+                )
+
+    # Two independent processes: each interleaving is only explored once
+    p = MDP([("a", "p0", "p1"), ("b", "p1", "p2")], name="P")
+    q = p.rename(("p", "q"), {"a": "c", "b": "d"}, "Q")
+    m = MDP(p, q)
+    full = m.explore()
+    reduced = m.explore(sleep_sets=True)
+    assert reduced.states == full.states == 9
+    assert sum(map(len, full.transition_map.values())) == 12
+    assert sum(map(len, reduced.transition_map.values())) == 8
+
+
+def test_smallest_set():
+    """The seed giving the smallest set is chosen, and cached"""
+    m = MDP(
+        [
+            ("a", "a0", ("a1", "x:=1")),
+            ("b", ("b0", "x=0"), "b1"),
+            ("c", "c0", "c1"),
+        ],
+        processes={"A": ("a0", "a1"), "B": ("b0", "b1"), "C": ("c0", "c1")},
+        init=("a0", "b0", "c0", "x:=0"),
+    )
+    for set_method in (conflicting_transitions, stubborn_sets):
+        algo = smallest_set(set_method)
+        assert [t.action for t in set_method(m, m.init)] == ["a", "b"]
+        assert [t.action for t in algo(m, m.init)] == ["c"]
+        assert [t.action for t in algo(m, m.init)] == ["c"]
+        assert (algo.hits, algo.misses) == (1, 1)
+        assert algo.__name__ == set_method.__name__
+        assert (
+            m.explore(set_method=algo).states
+            < m.explore(set_method=set_method).states
+        )
+
+
+def test_memoize():
+    """Cached sets are shared between states with the same relevant part"""
+
+    def process(i: int) -> MDP:
+        return MDP(
+            [
+                (f"a{i}", f"p{i}0", (f"p{i}1", f"x{i}:=1")),
+                (
+                    f"b{i}",
+                    (f"p{i}1", f"x{i}=1"),
+                    {f"p{i}2": 0.5, f"p{i}0": 0.5},
+                ),
+                (f"c{i}", f"p{i}2", (f"p{i}0", f"x{i}:=0")),
+            ],
+            name=f"P{i}",
+            init=(f"p{i}0", f"x{i}:=0"),
+        )
+
+    m = MDP(*(process(i) for i in range(3)))
+    expected = m.explore(set_method=ample_sets).transition_map
+    for maxsize in (2**16, 1):
+        algo = memoize(ample_sets, maxsize)
+        assert algo.cycle_proviso
+        assert m.explore(set_method=algo).transition_map == expected
+        info = algo.cache_info()
+        assert info.hits + info.misses == len(expected)
+        assert info.currsize <= maxsize
+    assert memoize(ample_sets).cache_info().hit_rate == 0.0
+    algo = memoize(ample_sets)
+    m.explore(set_method=algo)
+    assert algo.cache_info().hit_rate > 0.9
+
+
+def test_set_method_context(godefroid_4_11: MDP):
+    """Set methods share the enabled transitions and dependency tables"""
+    m = godefroid_4_11
+    s = m.init
+    ctx = Context(m, s, m.enabled(s))
+    assert ctx.enabled == m.enabled(s)
+    assert ctx.take_one() == m.enabled_take_one(s)
+    assert all(ctx.is_enabled(t) == t.is_enabled(s) for t in m.transitions)
+    assert ctx.tables is dependency_tables(m)
+    for set_method in (conflicting_transitions, stubborn_sets, ample_sets):
+        assert set_method(m, s, ctx=ctx) == set_method(m, s)
+
+    calls = []
+
+    def old_set_method(mdp: MDP, s: State):
+        calls.append(s)
+        return mdp.enabled(s)
+
+    adapted = with_context(old_set_method)
+    assert adapted.__name__ == "old_set_method"
+    assert adapted(m, s, ctx=ctx) == m.enabled(s)
+    assert with_context(stubborn_sets) is stubborn_sets
+    assert len(list(m.search(set_method=old_set_method))) == 7
+    assert len(calls) > 1
+
+    # Biased set methods still take a seed, so they can be wrapped again
+    biased = transition_bias(stubborn_sets, "t4")
+    expected = len(list(m.search(set_method=biased)))
+    assert len(list(m.search(set_method=memoize(biased)))) == expected
+    assert len(list(m.search(set_method=smallest_set(biased)))) == expected
+
+
+def test_variable_ownership(godefroid_4_11: MDP, dining_philosophers: MDP):
+    """Only write-shared variables make parallel transitions dependent"""
+    m = MDP(
+        [
+            ("a", ("a0", "c=1"), ("a1", "x:=1, f:=1")),
+            ("b", ("a1", "x=1"), ("a0", "x:=0")),
+            ("d", ("b0", "c=1 & f=1"), "b1"),
+        ],
+        processes={"A": ("a0", "a1"), "B": ("b0", "b1")},
+        init=("a0", "b0", "c:=1, f:=0, x:=0"),
+    )
+    assert variable_ownership(m) == {
+        "c": "read-shared",
+        "f": "write-shared",
+        "x": "local",
+    }
+    tables = dependency_tables(m)
+    a, b, d = m.transitions
+    assert tables.shared(a) == {op for op in a.used() if op.left == "f"}
+    assert not tables.shared(b)
+    assert tables.conflicting(a) == {a, d}
+    assert tables.conflicting(b) == {b}
+
+    # Same relations as comparing all operations
+    for m in (godefroid_4_11, dining_philosophers):
+        tables = dependency_tables(m)
+        for t1 in m.transitions:
+            assert tables.conflicting(t1) == {
+                t2
+                for t2 in m.transitions
+                if t1.in_conflict(t2)
+                or (t1.is_parallel(t2) and t1.can_be_dependent(t2))
+            }
+            assert tables.dependent(t1) == {
+                t2
+                for t2 in m.transitions
+                if t1.in_conflict(t2)
+                or (t1.is_parallel(t2) and t1.do_not_accord(t2))
+            }
+
+
+def test_confluence():
+    """Confluent internal transitions are taken alone"""
+    m = MDP(
+        [
+            ("a", "p0", ("p1", "f:=1")),
+            ("b", ("q0", "f=0"), "q1"),
+            ("tau_1", "r0", "r1"),
+            ("tau_2", "r1", {"r2": 0.5, "r3": 0.5}),
+            ("tau_3", "r2", "r3"),
+        ],
+        processes={
+            "P": ("p0", "p1"),
+            "Q": ("q0", "q1"),
+            "R": ("r0", "r1", "r2", "r3"),
+        },
+        init=("p0", "q0", "r0", "f:=0"),
+    )
+    # tau_2 is probabilistic, a and b do not accord
+    assert {t.action for t in confluent_transitions(m)} == {"tau_1", "tau_3"}
+
+    def deadlocks(result):
+        return {s for s, act in result.transition_map.items() if not act}
+
+    full = m.explore()
+    stubborn = m.explore(set_method=stubborn_sets)
+    for set_method in (confluence, confluence_reduction(stubborn_sets)):
+        reduced = m.explore(set_method=set_method)
+        assert deadlocks(reduced) == deadlocks(full)
+        assert reduced.states < full.states
+    reduced = m.explore(set_method=confluence_reduction(stubborn_sets))
+    assert reduced.states <= stubborn.states
+
+
+def test_confluence_reduction_does_not_add_states():
+    """The cycle proviso is only added where a confluent transition is taken"""
+    for model in (leader_election(3), bounded_queue(3)):
+        m = MDP(*model)
+        for set_method in (stubborn_sets, ample_sets):
+            wrapped = m.explore(set_method=set_method)
+            reduced = m.explore(set_method=confluence_reduction(set_method))
+            assert reduced.states <= wrapped.states
+
+
+def test_cached_tables_do_not_keep_mdps_alive():
+    """The dependency tables and confluent transitions are freed with the MDP"""
+    refs = []
+    for _ in range(3):
+        m = MDP(
+            MDP([("a", "p0", "p1"), ("tau_1", "p1", "p0")], name="P"),
+            MDP([("c", "q0", "q1")], name="Q"),
+        )
+        p = MDP([("b", "r0", "r0")], name="R")
+        for mdp in (m, p):
+            list(mdp.search(set_method=stubborn_sets))
+            list(mdp.search(set_method=confluence))
+            refs.append(weakref.ref(mdp))
+    del m, p, mdp
+    gc.collect()
+    assert all(ref() is None for ref in refs)
@@ -0,0 +1,68 @@
+"""Unit-tests for the `estimate` module"""
+
+from benchmarks.models import philosophers
+from mdptools import MarkovDecisionProcess as MDP
+from mdptools.estimate import (
+    APPROXIMATE,
+    DISK,
+    MEMORY,
+    Estimate,
+    choose_mode,
+    estimate,
+    visited_set,
+)
+from mdptools.visited import (
+    BitstateHashing,
+    DiskVisitedSet,
+    HashCompaction,
+    VisitedSet,
+)
+
+
+def test_estimate_exhaustive(godefroid_4_11: MDP):
+    """Small state spaces are counted exactly"""
+    result = godefroid_4_11.explore()
+    est = estimate(godefroid_4_11)
+    assert est.exact
+    assert est.states == result.states
+    assert est.transitions == sum(map(len, result.transition_map.values()))
+    assert est.state_bytes > 0
+    assert est.packed_bytes > 0
+
+
+def test_estimate_sampling():
+    m = MDP(*philosophers(5))
+    states = m.explore(silent=True).states
+    est = estimate(m, exact_states=50, samples=500, timeout=60, seed=1)
+    assert est.method == "collisions"
+    assert est.samples == 500
+    assert est.collisions > 0
+    # The estimate is within a small factor of the 242 states
+    assert states / 4 <= est.states <= states * 2
+    assert est.transitions > est.states
+
+
+def test_choose_mode(tmp_path):
+    est = Estimate(
+        10**6, 10**7, "collisions", state_bytes=400, packed_bytes=50
+    )
+    assert choose_mode(est, memory=10**9, disk=10**9) == MEMORY
+    assert choose_mode(est, memory=10**8, disk=10**9) == DISK
+    assert choose_mode(est, memory=10**8, disk=10**7) == APPROXIMATE
+
+    assert type(visited_set(MEMORY, est)) is VisitedSet
+    assert isinstance(
+        visited_set(DISK, est, path=str(tmp_path / "visited")), DiskVisitedSet
+    )
+    assert isinstance(
+        visited_set(APPROXIMATE, est, memory=10**8), HashCompaction
+    )
+    bitstate = visited_set(APPROXIMATE, est, memory=10**6)
+    assert isinstance(bitstate, BitstateHashing)
+    assert bitstate.bits == 4 * 10**6
+
+
+def test_search_auto_visited(godefroid_4_11: MDP):
+    result = godefroid_4_11.explore(visited="auto")
+    assert result.complete
+    assert result.states == 7
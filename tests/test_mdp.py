@@ -1,6 +1,7 @@
 """Unit-tests for the main `mdp` module
 """
 from mdptools import MarkovDecisionProcess as MDP
+from mdptools.model.commands import command, guard
 
 
 def test_enabled(stmdp: MDP):
@@ -45,3 +46,15 @@ def test_instantiate_system():
     )
 
     assert not m.is_process
+
+
+def test_op_do_not_accord():
+    (w0,) = command(["x:=0"]).expr
+    (w1,) = command(["x:=1"]).expr
+    (w1_y,) = command(["y:=1"]).expr
+    ((g1,),) = guard("x=1").expr
+    assert w0.do_not_accord(w1)
+    assert not w1.do_not_accord(w1)
+    assert w0.do_not_accord(g1) and g1.do_not_accord(w0)
+    assert not w1.do_not_accord(g1)
+    assert not w1_y.do_not_accord(g1)
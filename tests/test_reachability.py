@@ -0,0 +1,39 @@
+"""Unit-tests for the `reachability` module"""
+
+from queue import LifoQueue
+from mdptools import MarkovDecisionProcess as MDP
+from mdptools.reachability import find_deadlock, reachable
+
+
+def test_find_deadlock(dining_philosophers: MDP):
+    witness = find_deadlock(dining_philosophers)
+    assert witness is not None
+    assert witness.state.s == {"a1", "b1"}
+    assert dining_philosophers.enabled(witness.state) == []
+    assert len(witness) == 2
+    assert set(witness.trace) == {"take-l_1", "take-l_2"}
+    assert witness.path[0] == dining_philosophers.init
+
+
+def test_find_deadlock_free(stmdp: MDP):
+    assert find_deadlock(stmdp) is None
+
+
+def test_reachable_trace(dining_philosophers: MDP):
+    m = dining_philosophers
+    witness = reachable(m, lambda s: "a2" in s, set_method=False)
+    assert witness.trace == ("take-l_1", "take-r_1")
+    # Replay the witness trace
+    s = m.init
+    for a, s_next in zip(witness.trace, witness.path[1:]):
+        tr = next(tr for tr in m.enabled(s) if tr.action == a)
+        assert s_next in tr.successors(s)
+        s = s_next
+    assert s == witness.state
+
+
+def test_unreachable(dining_philosophers: MDP):
+    witness = reachable(
+        dining_philosophers, lambda s: "a2" in s and "b2" in s, queue=LifoQueue
+    )
+    assert witness is None
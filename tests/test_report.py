@@ -0,0 +1,42 @@
+"""Unit-tests for the `report` module"""
+
+from mdptools import MarkovDecisionProcess as MDP
+from mdptools.report import compare_set_methods, format_report, load_model
+from mdptools.set_methods import stubborn_sets, overmans_algorithm
+
+
+def test_compare_set_methods(godefroid_4_11: MDP):
+    """Each set method, and its biased variants, gets a row"""
+    m = godefroid_4_11
+    stats = compare_set_methods(
+        m, [None, overmans_algorithm, stubborn_sets], memory=False
+    )
+    names = [row.name for row in stats]
+    assert names[:3] == [
+        "classic",
+        "overmans_algorithm",
+        "overmans_algorithm [t1]",
+    ]
+    assert len(stats) == 1 + 2 * (1 + len(m.actions))
+    assert [row.states for row in stats[:2]] == [7, 6]
+    assert stats[0].set_method_time == 0.0
+    assert all(row.complete and row.transitions > 0 for row in stats)
+    assert all(row.set_method_time <= row.elapsed for row in stats)
+
+    stats = compare_set_methods(m, [None, stubborn_sets], biased=False)
+    assert all(row.peak_memory > 0 for row in stats)
+    table = format_report(stats).splitlines()
+    assert len(table) == 4
+    assert table[0].startswith("set method")
+    assert table[3].startswith("stubborn_sets")
+
+
+def test_load_model(tmp_path):
+    """Models are loaded from a file, by name or as the only MDP in it"""
+    model = tmp_path / "model.py"
+    model.write_text(
+        "from mdptools import MarkovDecisionProcess as MDP\n"
+        "m = MDP([('a', 's0', 's1')], name='M')\n"
+    )
+    assert load_model(str(model)).name == "M"
+    assert load_model(f"{model}:m").name == "M"
@@ -0,0 +1,279 @@
+"""Unit-tests for the `search` module and its visited-set backends"""
+
+import pickle
+import tempfile
+from queue import LifoQueue, SimpleQueue
+
+from mdptools import MarkovDecisionProcess as MDP
+from mdptools.model import State
+from mdptools.search import (
+    Budget,
+    CancellationToken,
+    ProgressReporter,
+    SearchListener,
+    SearchStats,
+)
+from mdptools.set_methods import ample_sets, stubborn_sets
+from mdptools.types import imdict
+from mdptools.visited import (
+    BitstateHashing,
+    DiskVisitedSet,
+    HashCompaction,
+    state_hash,
+)
+
+
+def test_state_hash_is_stable(godefroid_4_11: MDP):
+    s = godefroid_4_11.init
+    assert state_hash(s) == state_hash(s.rename({}))
+    assert state_hash(s) != state_hash(godefroid_4_11.enabled()[0].pre)
+
+
+def test_bitstate_hashing(godefroid_4_11: MDP):
+    visited = BitstateHashing(bits=2**16, k=3)
+    state_space = list(godefroid_4_11.search(visited=visited))
+    report = visited.report()
+    assert len(state_space) == 7
+    assert len(visited) == 7
+    assert godefroid_4_11.init in visited
+    assert report["collision_probability"] < 1e-9
+    assert 0.99 < report["coverage"] <= 1.0
+
+
+def test_bitstate_hashing_with_set_method(
+    baier_p1: MDP, baier_p2: MDP, baier_rm: MDP
+):
+    m = MDP(baier_p1, baier_p2, baier_rm)
+    visited = BitstateHashing(bits=2**16)
+    state_space = list(m.search(set_method=stubborn_sets, visited=visited))
+    assert len(state_space) == 10
+
+
+def test_bitstate_hashing_saturated(godefroid_4_11: MDP):
+    visited = BitstateHashing(bits=1, k=1)
+    state_space = list(godefroid_4_11.search(visited=visited))
+    assert len(state_space) == 1
+    assert visited.collision_probability == 1.0
+
+
+def test_hash_compaction(baier_p1: MDP, baier_p2: MDP, baier_rm: MDP):
+    m = MDP(baier_p1, baier_p2, baier_rm)
+    expected = len(list(m.search()))
+    visited = HashCompaction(capacity=4)
+    state_space = list(m.search(visited=visited))
+    assert len(state_space) == expected
+    assert len(visited) == expected
+    assert all(s in visited for s, _ in state_space)
+    assert visited.nbytes >= 8 * expected
+    assert visited.omission_probability < 1e-15
+
+
+def test_hash_compaction_load():
+    """About 8 bytes per state in a table sized for the states"""
+    states = [State(frozenset({f"s{i}"}), imdict()) for i in range(115)]
+    visited = HashCompaction(capacity=len(states))
+    assert all(visited.add(s) for s in states)
+    assert len(visited) == len(states)
+    assert all(s in visited for s in states)
+    assert visited.nbytes <= 9 * len(states)
+    assert not hasattr(visited, "_states")
+
+
+def test_explore_complete(godefroid_4_11: MDP):
+    result = godefroid_4_11.explore()
+    assert result.complete
+    assert result.states == 7
+    assert len(result.transition_map) == 7
+    assert result.frontier == 0
+
+
+def test_budget_max_states(godefroid_4_11: MDP):
+    result = godefroid_4_11.explore(budget=Budget(max_states=3))
+    assert not result.complete
+    assert result.limit == "max_states"
+    assert result.states == 3
+    assert result.frontier > 0
+
+
+def test_budget_max_depth(godefroid_4_11: MDP):
+    levels = [
+        level for _, _, level in godefroid_4_11.bfs(budget=Budget(max_depth=1))
+    ]
+    assert levels == [0, 1, 1]
+
+    result = godefroid_4_11.explore(budget=Budget(max_depth=1))
+    assert result.limit == "max_depth"
+    assert result.frontier > 0
+
+
+def test_budget_timeout_and_memory(godefroid_4_11: MDP):
+    result = godefroid_4_11.explore(budget=Budget(timeout=0))
+    assert result.limit == "timeout"
+    assert result.states == 0
+
+    result = godefroid_4_11.explore(
+        budget=Budget(max_memory=1, check_interval=1)
+    )
+    assert result.limit == "max_memory"
+    assert result.states == 0
+
+    # The memory is checked every `check_interval` states taken from the queue
+    result = godefroid_4_11.explore(
+        budget=Budget(max_memory=1, check_interval=4)
+    )
+    assert result.limit == "max_memory"
+    assert 0 < result.states < 4
+    assert godefroid_4_11.explore(budget=Budget(max_memory=1)).complete
+
+
+def test_budget_frontier(godefroid_4_11: MDP):
+    """The frontier counts the distinct states left to explore"""
+    levels = [level for _, _, level in godefroid_4_11.bfs()]
+    result = godefroid_4_11.explore(
+        queue=SimpleQueue, budget=Budget(max_depth=1)
+    )
+    assert result.frontier == levels.count(2)
+
+    result = godefroid_4_11.explore(
+        set_method=ample_sets, budget=Budget(max_states=3)
+    )
+    assert 0 < result.frontier <= len(levels) - result.states
+
+
+def test_compress_tau():
+    pipeline = MDP(
+        [
+            ("a", "p0", "p1"),
+            ("tau_1", "p1", "p2"),
+            ("tau_2", "p2", "p3"),
+            ("b", "p3", "p0"),
+        ],
+        name="P",
+    )
+    m = MDP(pipeline, pipeline.rename(("p", "q"), {"a": "c", "b": "d"}, "Q"))
+    full = m.explore()
+    compressed = m.explore(compress_tau=True)
+    assert full.states == 16
+    assert compressed.states == 4
+    assert all(
+        not (s.s & {"p1", "p2", "q1", "q2"}) for s in compressed.transition_map
+    )
+
+    labelled = m.explore(compress_tau=True, labels=lambda s: "p2" in s)
+    assert labelled.states == 8
+
+
+def test_search_stats(godefroid_4_11: MDP):
+    stats = SearchStats()
+    result = godefroid_4_11.explore(
+        set_method=stubborn_sets, listeners=[stats]
+    )
+    assert stats.visits == result.states
+    assert stats.transitions == sum(map(len, result.transition_map.values()))
+    assert sum(stats.fanout.values()) == result.states
+    assert stats.set_method_calls > 0
+    assert stats.set_method_time > 0
+    assert stats.enabled_checks >= result.states * len(
+        godefroid_4_11.transitions
+    )
+    assert stats.queue_high_water >= 1
+
+
+def test_search_listener(godefroid_4_11: MDP):
+    class Recorder(SearchListener):
+        def __init__(self):
+            self.events = []
+
+        def on_begin(self, mdp, s):
+            self.events.append("begin")
+
+        def on_visit(self, s, level, enabled):
+            self.events.append("visit")
+
+        def on_end(self, result):
+            self.events.append("end")
+
+    recorder = Recorder()
+    result = godefroid_4_11.explore(listeners=[recorder])
+    assert recorder.events[0] == "begin"
+    assert recorder.events[-1] == "end"
+    assert recorder.events.count("visit") == result.states
+
+
+def test_progress_reporter(godefroid_4_11: MDP):
+    reports = []
+    reporter = ProgressReporter(
+        reports.append, interval=0, expected_states=100, every=1
+    )
+    result = godefroid_4_11.explore(queue=SimpleQueue, listeners=[reporter])
+    assert len(reports) == result.states + 1
+    assert [p.states for p in reports[:-1]] == list(
+        range(1, result.states + 1)
+    )
+    assert reports[-1].states == result.states
+    assert reports[-1].frontier == 0
+    assert (
+        reports[-1].eta == (100 - result.states) / reports[-1].states_per_sec
+    )
+    levels = [p.level for p in reports]
+    assert levels == sorted(levels)
+
+
+def test_cancellation(godefroid_4_11: MDP):
+    cancel = CancellationToken()
+    reporter = ProgressReporter(
+        lambda p: p.states >= 3 and cancel.cancel(), interval=0, every=1
+    )
+    result = godefroid_4_11.explore(listeners=[reporter], cancel=cancel)
+    assert result.limit == "cancelled"
+    assert result.states == 3
+    assert result.frontier > 0
+
+
+def test_disk_visited_set(
+    tmp_path, baier_p1: MDP, baier_p2: MDP, baier_rm: MDP
+):
+    m = MDP(baier_p1, baier_p2, baier_rm)
+    expected = len(list(m.search()))
+    visited = DiskVisitedSet(str(tmp_path / "visited"))
+    state_space = list(m.search(visited=visited))
+    assert len(state_space) == expected
+    assert len(visited) == expected
+    assert all(s in visited for s, _ in state_space)
+
+    restored = pickle.loads(pickle.dumps(visited))
+    visited.close()
+    assert len(restored) == expected
+    assert not restored.add(m.init)
+    restored.close()
+
+
+def test_cycle_proviso_self_loop():
+    """A reduced set whose only successor is the state itself closes a cycle"""
+    p = MDP([("a", "p0", "p0")], name="P")
+    q = MDP([("c", "q0", "q1")], name="Q")
+    m = MDP(p, q)
+    expected = {frozenset(s.s) for s, _ in m.search()}
+    assert len(expected) == 2
+    for queue in (LifoQueue, SimpleQueue):
+        state_space = m.search(set_method=ample_sets, queue=queue)
+        assert {frozenset(s.s) for s, _ in state_space} == expected
+
+
+def test_disk_visited_set_cleanup(tmp_path, monkeypatch, godefroid_4_11: MDP):
+    """Temporary files are removed with the sets created by the search"""
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    visited = DiskVisitedSet()
+    assert list(tmp_path.iterdir())
+    visited.close()
+    assert not list(tmp_path.iterdir())
+
+    result = godefroid_4_11.explore(visited=DiskVisitedSet)
+    assert result.states == 7
+    assert not list(tmp_path.iterdir())
+
+    generator = godefroid_4_11.search(visited=DiskVisitedSet)
+    next(generator)
+    assert list(tmp_path.iterdir())
+    generator.close()
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,76 @@
+"""Unit-tests for the `swarm` module"""
+
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from mdptools import MarkovDecisionProcess as MDP
+from mdptools.set_methods import stubborn_sets
+from mdptools.swarm import swarm
+
+
+def test_swarm_finds_deadlock(dining_philosophers: MDP):
+    result = swarm(dining_philosophers, runs=4, workers=2, bits=2**12)
+    assert result is not None
+    assert dining_philosophers.enabled(result.state) == []
+    assert result.state.s == {"a1", "b1"}
+
+
+def test_swarm_with_set_method(dining_philosophers: MDP):
+    result = swarm(
+        dining_philosophers, set_method=stubborn_sets, runs=3, workers=1
+    )
+    assert result is not None
+    assert result.run == 0
+    assert result.bias is None
+
+
+def test_swarm_without_violation(stmdp: MDP):
+    result = swarm(stmdp, runs=2, workers=2, bits=2**12)
+    assert result is None
+
+
+def test_swarm_custom_target(dining_philosophers: MDP):
+    result = swarm(
+        dining_philosophers,
+        target=lambda s, _: s.ctx["f1"] == 1 and s.ctx["f2"] == 1,
+        runs=2,
+        workers=2,
+    )
+    assert result is not None
+    assert result.state.ctx == {"f1": 1, "f2": 1}
+
+
+def test_swarm_timeout_serial(dining_philosophers: MDP):
+    start = time.monotonic()
+    result = swarm(
+        dining_philosophers,
+        target=lambda *_: time.sleep(0.01),
+        runs=100,
+        workers=1,
+        timeout=0.1,
+    )
+    assert result is None
+    assert time.monotonic() - start < 5.0
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="requires the fork start method",
+)
+def test_swarm_worker_killed(stmdp: MDP):
+    killed = multiprocessing.get_context("fork").Value("b", 0)
+
+    def target(*_):
+        with killed.get_lock():
+            first = not killed.value
+            killed.value = 1
+        if first:
+            os._exit(1)
+        return False
+
+    result = swarm(stmdp, target=target, runs=2, workers=2, bits=2**12)
+    assert result is None
+    assert killed.value == 1
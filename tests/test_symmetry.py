@@ -0,0 +1,57 @@
+"""Unit-tests for the `symmetry` module"""
+
+import pytest
+from mdptools import MarkovDecisionProcess as MDP
+from mdptools.symmetry import Symmetry, detect_process_groups, symmetry
+from mdptools.utils import float_is
+
+
+def make_sensor(i: int) -> MDP:
+    s = [f"active_{i}", f"detected_{i}", f"alert_{i}", f"inactive_{i}"]
+    return MDP(
+        [
+            (f"detect_{i}", s[0], {s[1]: 0.8, s[2]: 0.2}),
+            (f"warn_{i}", s[1], s[2]),
+            (f"shutdown_{i}", s[2], s[3]),
+            (f"off_{i}", s[3]),
+        ],
+        init=s[0],
+        name=f"S{i}",
+    )
+
+
+@pytest.fixture
+def sensors():
+    return MDP(*(make_sensor(i) for i in range(3)))
+
+
+def test_detect_process_groups(sensors: MDP):
+    groups = detect_process_groups(sensors)
+    assert len(groups) == 1
+    assert len(groups[0]) == 3
+
+
+def test_process_symmetry(sensors: MDP):
+    sym = symmetry(sensors)
+    assert len(sym) == 6
+    full = [s for s, _ in sensors.search()]
+    quotient = sensors.explore(symmetry=sym)
+    assert len(full) == 4**3
+    assert quotient.states == len(set(map(sym.canonical, full))) == 20
+    for act in quotient.transition_map.values():
+        for dist in act.values():
+            assert float_is(sum(dist.values()), 1.0)
+
+
+def test_symmetry_with_shared_variables(dining_philosophers: MDP):
+    sym = symmetry(dining_philosophers, ["A", "B"])
+    assert len(sym) == 2
+    full = [s for s, _ in dining_philosophers.search()]
+    quotient = dining_philosophers.explore(symmetry=sym)
+    assert quotient.states == len(set(map(sym.canonical, full)))
+    assert quotient.states < len(full)
+
+
+def test_not_an_automorphism(dining_philosophers: MDP):
+    with pytest.raises(ValueError):
+        Symmetry(dining_philosophers, [{"a0": "b0", "b0": "a0"}])